@@ -14,7 +14,12 @@ bl_info = {
 # ─────────────────────────────────────────────────────────────────────────────
 # Imports
 # ─────────────────────────────────────────────────────────────────────────────
-import bpy, gpu, os, blf, math
+import bpy, gpu, os, blf, math, re, sys, json, time
+import bpy.utils.previews
+import numpy as np
+from bisect import bisect_left
+from collections import OrderedDict
+from bpy.app.handlers import persistent
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 
@@ -22,7 +27,33 @@ from mathutils import Vector
 # Globals
 # ─────────────────────────────────────────────────────────────────────────────
 _shader, _tex_cache, _handle = None, {}, None
+_shader_adjusts = False
 _theme_colors = {}
+_seq_files, _seq_rings = {}, {}
+_tex_seen = {}            # filepath -> time its texture was last drawn
+_last_evict = [0.0]       # time of the last idle-texture sweep
+_snap_guides = ([], [])   # board x / y of the snap lines shown while dragging
+_pixel_cache = OrderedDict()   # source path -> (h, w, 4) uint8 pixels
+_phash_cache = {}              # (path, mtime) -> 64-bit perceptual hash
+_recorder = None               # drag-mode event log while recording
+_mask_cache = {}                # filepath -> (w, h, packed alpha bits) | None
+_mask_queue = OrderedDict()     # filepath -> loaded image waiting for its mask
+
+MASK_SIZE = 128         # Longest side of the alpha hit-test masks
+MASK_TICK = 0.05        # Seconds between two queued alpha masks
+
+_previews, _preview_queue = None, []   # list thumbnails, filled progressively
+_search_index = [None, None]   # (collection key, SearchIndex) for the list filter
+_index_generation = 0          # bumped whenever names or tags change
+_board_cache = [None, None]    # (collection key, rect columns) for culling
+_board_generation = 0          # bumped whenever a rect, layer or visibility changes
+PREVIEWS_PER_TICK = 4   # Thumbnails requested per timer tick
+
+PIXEL_CACHE_BYTES = 256 * 2**20   # Budget for eyedropper pixel buffers
+
+PREFETCH_PER_TICK = 2   # Sequence frames decoded per timer tick
+
+TEX_IDLE_SECONDS = 10.0  # Off-screen time after which a texture is released
 
 DEFAULT_ORTHO_OFFSET = 30.0
 
@@ -52,32 +83,276 @@ class OrthoImageSettings(bpy.types.PropertyGroup):
     alpha:    bpy.props.FloatProperty(name="Alpha", default=1.0, min=0.0, max=1.0)
     size:     bpy.props.FloatProperty(name="Size",  default=20.0, min=0.01)
 
+    # Crop of the shared turnaround sheet, in 0‑1 image space from bottom-left
+    use_sheet: bpy.props.BoolProperty(name="Use Sheet", default=False,
+                                      description="Show a region of the shared turnaround sheet instead of a separate file")
+    crop_min:  bpy.props.FloatVectorProperty(name="Crop Min", size=2, default=(0.0, 0.0), min=0.0, max=1.0)
+    crop_max:  bpy.props.FloatVectorProperty(name="Crop Max", size=2, default=(1.0, 1.0), min=0.0, max=1.0)
+    packed_image: bpy.props.PointerProperty(type=bpy.types.Image, name="Packed Image",
+                                            description="Optimised packed copy shown instead of the file")
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Utility helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def safe_load_image(filepath):
-    """Safely load an image and create texture, with error handling"""
-    if not filepath or not os.path.exists(filepath):
+def safe_load_image(filepath, packed=None):
+    """Safely load an image and create texture, with error handling
+
+    A packed optimised copy is used as is, the file need not exist then.
+    """
+    if not packed and (not filepath or not os.path.exists(filepath)):
         return None, None
 
     try:
-        img = bpy.data.images.load(filepath, check_existing=True)
-        tex = gpu.texture.from_image(img)
+        img = packed or bpy.data.images.load(filepath, check_existing=True)
+        schedule_mask(filepath, img)
+        tex = upload_texture(img)
         return img, tex
     except Exception as e:
         print(f"Failed to load image {filepath}: {e}")
         return None, None
 
+def upload_texture(img):
+    """Create the GPU texture for img; in GPU-only mode drop its CPU pixels"""
+    tex = gpu.texture.from_image(img)
+    if bpy.context.scene.bref_gpu_only:
+        # The texture keeps its own reference, Blender re-decodes on demand
+        img.buffers_free()
+    return tex
+
+
+# Bytes per texel of the formats gpu.texture.from_image produces
+_TEXEL_BYTES = {'RGBA8': 4, 'SRGB8_A8': 4, 'RGBA16F': 8, 'RGBA32F': 16}
+
+
+def image_memory(img, tex):
+    """Approximate (RAM, VRAM) bytes held by one uploaded reference
+
+    Only reads state that is already resident; asking the image for its size
+    or channels would decode it again.
+    """
+    vram = tex.width * tex.height * _TEXEL_BYTES.get(tex.format, 4)
+    try:
+        ram = vram if img and img.has_data else 0
+    except ReferenceError:
+        # The datablock went away (file load, undo); the texture is all that is left
+        ram = 0
+    return ram, vram
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def image_pixels(filepath, image=None):
+    """Full-resolution pixels of filepath as an (h, w, 4) uint8 array, cached
+
+    Filled with one foreach_get call and kept as 8-bit, a quarter of the
+    float copy; in GPU-only mode the CPU buffer is freed again right after.
+    image, a packed copy, is read instead of the file when given.
+    """
+    px = _pixel_cache.get(filepath)
+    if px is not None:
+        _pixel_cache.move_to_end(filepath)
+        return px
+    img = image or bpy.data.images.load(filepath, check_existing=True)
+    w, h = img.size
+    px = np.empty(w * h * 4, dtype=np.float32)
+    img.pixels.foreach_get(px)
+    if bpy.context.scene.bref_gpu_only:
+        img.buffers_free()
+    np.clip(px, 0.0, 1.0, out=px)
+    px *= 255.0
+    px += 0.5
+    px = _pixel_cache[filepath] = px.astype(np.uint8).reshape(h, w, 4)
+    # Always keep the newest, however large, so repeated picks stay cheap
+    total = sum(a.nbytes for a in _pixel_cache.values())
+    while total > PIXEL_CACHE_BYTES and len(_pixel_cache) > 1:
+        total -= _pixel_cache.popitem(last=False)[1].nbytes
+    return px
+
+
+def decode_small(filepath, max_side=64, size=None, image=None):
+    """Pixels of filepath scaled to fit max_side (or to exactly size), as an
+    (h, w, 4) array
+
+    Decodes into a throw-away datablock so the reference's own image and
+    texture are left untouched; with image, a copy of it stands in for the file.
+    """
+    tmp = image.copy() if image else bpy.data.images.load(filepath, check_existing=False)
+    return _scaled_pixels(tmp, max_side, size)
+
+
+def _scaled_pixels(tmp, max_side, size):
+    """Scale the throw-away datablock tmp, read its pixels and remove it"""
+    try:
+        if size:
+            w, h = size
+        else:
+            w, h = tmp.size
+            f = min(1.0, max_side / max(w, h, 1))
+            w, h = max(1, round(w * f)), max(1, round(h * f))
+        tmp.scale(w, h)
+        px = np.empty(w * h * 4, dtype=np.float32)
+        tmp.pixels.foreach_get(px)
+        return px.reshape(h, w, 4)
+    finally:
+        bpy.data.images.remove(tmp)
+
+
+_LUMA = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def perceptual_hash(filepath):
+    """64-bit difference hash of a 9×8 grayscale decode, cached by path and mtime"""
+    key = (filepath, os.path.getmtime(filepath))
+    h = _phash_cache.get(key)
+    if h is None:
+        px = decode_small(filepath, size=(9, 8))
+        # Composite over white so cut-outs hash like their visible shape
+        gray = (px[..., :3] * px[..., 3:] + (1.0 - px[..., 3:])) @ _LUMA
+        bits = (gray[:, 1:] > gray[:, :-1]).ravel()
+        h = _phash_cache[key] = int.from_bytes(np.packbits(bits).tobytes(), "big")
+    return h
+
+
+def hash_distances(h, hashes):
+    """Hamming distance from h to every hash in a uint64 array"""
+    x = np.bitwise_xor(np.asarray(hashes, dtype=np.uint64), np.uint64(h))
+    return _POPCOUNT[x.view(np.uint8)].reshape(-1, 8).sum(1)
+
+
+def kmeans(points, k, iterations=12, seed=0):
+    """Vectorised k-means on (n, c) points, returns (centres, counts)"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(points))
+    centres = points[rng.choice(len(points), k, replace=False)].copy()
+    for _ in range(iterations):
+        labels = ((points[:, None, :] - centres[None, :, :]) ** 2).sum(-1).argmin(1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=points[:, c], minlength=k)
+                         for c in range(points.shape[1])], axis=1)
+        used = counts > 0
+        centres[used] = sums[used] / counts[used, None]
+    return centres, counts
+
+
+def build_alpha_mask(img):
+    """Downsampled 1-bit alpha of a loaded image, or None if it is fully opaque
+
+    Scales a copy of the datablock, which reuses its decoded buffer instead
+    of reading the file again.
+    """
+    px = _scaled_pixels(img.copy(), MASK_SIZE, None)
+    opaque = px[..., 3] > 0.5
+    if opaque.all():
+        return None  # The bounding rect is already exact
+    h, w = opaque.shape
+    return w, h, np.packbits(opaque.ravel())
+
+
+def schedule_mask(filepath, img):
+    """Queue the alpha mask of a freshly loaded image for the mask timer
+
+    Called before upload_texture; in GPU-only mode the pixels are about to be
+    freed, so the mask is built right away from the resident buffer.
+    24-bit images have no alpha and never get a mask.
+    """
+    if img.depth == 24 or filepath in _mask_cache or filepath in _mask_queue:
+        return
+    if bpy.context.scene.bref_gpu_only:
+        _build_mask(filepath, img)
+        return
+    _mask_queue[filepath] = img
+    if not bpy.app.timers.is_registered(_mask_tick):
+        bpy.app.timers.register(_mask_tick, first_interval=MASK_TICK)
+
+
+def _build_mask(filepath, img):
+    try:
+        _mask_cache[filepath] = build_alpha_mask(img)
+    except Exception as e:
+        _mask_cache[filepath] = None
+        print(f"BRef: no alpha mask for {filepath}: {e}")
+
+
+def _mask_tick():
+    # One mask per tick, spaced out, keeps the UI responsive during bulk imports
+    _build_mask(*_mask_queue.popitem(last=False))
+    return MASK_TICK if _mask_queue else None
+
+
 def snap_to_grid(value, grid_size):
     """Snap a value to the nearest grid point"""
     return round(value / grid_size) * grid_size
 
 
+# Non-destructive adjustments, evaluated per fragment so toggling them never
+# touches the CPU copy or re-uploads the texture.
+#   adjust     = (contrast, exposure, grayscale, invert)
+#   silhouette = (enabled, luminance threshold, -, -)
+_ADJUST_VERT = """
+void main()
+{
+  uvInterp = texCoord;
+  gl_Position = ModelViewProjectionMatrix * vec4(pos, 0.0, 1.0);
+}
+"""
+
+_ADJUST_FRAG = """
+void main()
+{
+  vec4 c = texture(image, uvInterp);
+  c.rgb *= exp2(adjust.y);
+  c.rgb = (c.rgb - 0.5) * adjust.x + 0.5;
+  float lum = dot(c.rgb, vec3(0.2126, 0.7152, 0.0722));
+  if (adjust.z > 0.5) {
+    c.rgb = vec3(lum);
+  }
+  if (adjust.w > 0.5) {
+    c.rgb = 1.0 - c.rgb;
+  }
+  c.rgb *= color.rgb;
+  if (silhouette.x > 0.5) {
+    c = vec4(0.0, 0.0, 0.0, step(0.5, c.a) * step(lum, silhouette.y));
+  }
+  FragColor = vec4(c.rgb, c.a * color.a);
+}
+"""
+
+
+def _adjust_shader():
+    iface = gpu.types.GPUStageInterfaceInfo("bref_adjust_iface")
+    iface.smooth('VEC2', "uvInterp")
+
+    info = gpu.types.GPUShaderCreateInfo()
+    info.push_constant('MAT4', "ModelViewProjectionMatrix")
+    info.push_constant('VEC4', "color")
+    info.push_constant('VEC4', "adjust")
+    info.push_constant('VEC4', "silhouette")
+    info.sampler(0, 'FLOAT_2D', "image")
+    info.vertex_in(0, 'VEC2', "pos")
+    info.vertex_in(1, 'VEC2', "texCoord")
+    info.vertex_out(iface)
+    info.fragment_out(0, 'VEC4', "FragColor")
+    info.vertex_source(_ADJUST_VERT)
+    info.fragment_source(_ADJUST_FRAG)
+    return gpu.shader.create_from_info(info)
+
+
 def shader():
-    global _shader
+    """Overlay image shader; the builtin IMAGE_COLOR if ours fails to build"""
+    global _shader, _shader_adjusts
     if _shader is None:
-        _shader = gpu.shader.from_builtin('IMAGE_COLOR')
+        try:
+            _shader, _shader_adjusts = _adjust_shader(), True
+        except Exception as e:
+            print(f"BRef: adjustment shader unavailable, using builtin: {e}")
+            _shader, _shader_adjusts = gpu.shader.from_builtin('IMAGE_COLOR'), False
     return _shader
 
 
@@ -113,16 +388,54 @@ def _cb_size(self, ctx):
         redraw(ctx)
 
 
+def _cb_rect(self, ctx):
+    global _board_generation
+    _board_generation += 1
+    redraw(ctx)
+
+
 def _cb_dims(self, ctx):
+    _cb_rect(self, ctx)
+
+
+def _cb_index(self, ctx):
+    global _index_generation
+    _index_generation += 1
+    redraw(ctx)
+
+
+def _cb_filepath(self, ctx):
+    # The stored hash described the old file
+    self.phash = ""
+    # Rings of sequences no reference shows any more
+    col = self.id_data.draggable_images
+    for fp in [fp for fp in _seq_rings if not any(o.filepath == fp for o in col)]:
+        release_sequence(fp)
+    _cb_index(self, ctx)
+
+
+def _cb_crop(self, ctx):
+    # Keep the pixel aspect of the cropped region when typing crop values
+    if self.maintain_aspect and self.original_width and self.original_height:
+        u0, v0, u1, v1 = crop_rect(self)
+        if u1 > u0 and v1 > v0:
+            self.height = self.width * (self.original_height * (v1 - v0)) / (self.original_width * (u1 - u0))
+    redraw(ctx)
+
+
+def _cb_source(self, ctx):
+    release_sequence(self.filepath)
     redraw(ctx)
 
 
 class DraggableImage(bpy.types.PropertyGroup):
     """Meta‑data for each viewport overlay image"""
 
-    filepath: bpy.props.StringProperty(subtype='FILE_PATH', update=lambda s, c: redraw(c))
-    x:        bpy.props.FloatProperty(default=100.0, update=lambda s, c: redraw(c))
-    y:        bpy.props.FloatProperty(default=100.0, update=lambda s, c: redraw(c))
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH', update=_cb_filepath)
+    tags:     bpy.props.StringProperty(name="Tags", update=_cb_index,
+                                       description="Words to find this reference by in the list filter")
+    x:        bpy.props.FloatProperty(default=100.0, update=_cb_rect)
+    y:        bpy.props.FloatProperty(default=100.0, update=_cb_rect)
     size:     bpy.props.FloatProperty(name="Size",   default=200.0, min=10.0, update=_cb_size)
     width:    bpy.props.FloatProperty(default=200.0, min=10.0, update=_cb_dims)
     height:   bpy.props.FloatProperty(default=200.0, min=10.0, update=_cb_dims)
@@ -130,15 +443,63 @@ class DraggableImage(bpy.types.PropertyGroup):
     original_height: bpy.props.FloatProperty(default=0.0)
     maintain_aspect: bpy.props.BoolProperty(default=True)
     alpha:    bpy.props.FloatProperty(default=1.0, min=0.0, max=1.0, update=lambda s, c: redraw(c))
-    layer:    bpy.props.IntProperty(default=0, update=lambda s, c: redraw(c))
+    layer:    bpy.props.IntProperty(default=0, update=_cb_rect)
+    visible:  bpy.props.BoolProperty(name="Visible", default=True, update=_cb_rect)
     flip_x:   bpy.props.BoolProperty(default=False, update=lambda s, c: redraw(c))
     flip_y:   bpy.props.BoolProperty(default=False, update=lambda s, c: redraw(c))
+    packed_image: bpy.props.PointerProperty(type=bpy.types.Image, name="Packed Image",
+                                            description="Optimised packed copy shown instead of the file")
+    duplicate_of: bpy.props.StringProperty(name="Duplicate Of",
+                                           description="File this reference looked like when it was imported")
+    phash:    bpy.props.StringProperty(name="Perceptual Hash", options={'HIDDEN'},
+                                       description="Hex perceptual hash of the file, saved so imports need not decode the board")
+
+    # Image sequences follow the scene frame
+    source_type: bpy.props.EnumProperty(
+        name="Source",
+        items=[('IMAGE',    "Image",          "Single still image"),
+               ('SEQUENCE', "Image Sequence", "Numbered frames that follow the scene frame")],
+        default='IMAGE', update=_cb_source)
+    frame_start:  bpy.props.IntProperty(name="Start Frame", default=1, update=lambda s, c: redraw(c),
+                                        description="Scene frame at which the first image is shown")
+    frame_offset: bpy.props.IntProperty(name="Offset", default=0, update=lambda s, c: redraw(c),
+                                        description="Number of images to skip from the start")
+    use_cyclic:   bpy.props.BoolProperty(name="Cyclic", default=True, update=lambda s, c: redraw(c),
+                                         description="Loop the sequence instead of holding the last image")
+
+    # Non-destructive crop, in 0‑1 texture space from bottom-left
+    use_crop: bpy.props.BoolProperty(name="Crop", default=False, update=_cb_crop)
+    crop_min: bpy.props.FloatVectorProperty(name="Crop Min", size=2, default=(0.0, 0.0), min=0.0, max=1.0,
+                                            update=_cb_crop)
+    crop_max: bpy.props.FloatVectorProperty(name="Crop Max", size=2, default=(1.0, 1.0), min=0.0, max=1.0,
+                                            update=_cb_crop)
+
+    # Display adjustments, applied in the overlay shader
+    grayscale: bpy.props.BoolProperty(name="Grayscale", default=False, update=lambda s, c: redraw(c))
+    invert:    bpy.props.BoolProperty(name="Invert", default=False, update=lambda s, c: redraw(c))
+    contrast:  bpy.props.FloatProperty(name="Contrast", default=1.0, min=0.0, soft_max=4.0,
+                                       update=lambda s, c: redraw(c))
+    exposure:  bpy.props.FloatProperty(name="Exposure", default=0.0, soft_min=-5.0, soft_max=5.0,
+                                       update=lambda s, c: redraw(c))
+    tint:      bpy.props.FloatVectorProperty(name="Tint", subtype='COLOR', size=3, default=(1.0, 1.0, 1.0),
+                                             min=0.0, max=1.0, update=lambda s, c: redraw(c))
+    use_silhouette: bpy.props.BoolProperty(name="Silhouette", default=False, update=lambda s, c: redraw(c),
+                                           description="Show opaque pixels darker than the threshold as solid black")
+    silhouette_threshold: bpy.props.FloatProperty(name="Threshold", default=1.0, min=0.0, max=1.0,
+                                                  update=lambda s, c: redraw(c))
 
 
 # ── Property group for scene-level ortho refs ───────────────────────────
 class OrthographicReferences(bpy.types.PropertyGroup):
     enabled: bpy.props.BoolProperty(name="Enable Orthographic References", default=False)
     offset:  bpy.props.FloatProperty(name="Distance", default=DEFAULT_ORTHO_OFFSET, min=0.0)
+    sheet_filepath: bpy.props.StringProperty(name="Turnaround Sheet", subtype='FILE_PATH',
+                                             description="One image holding several views, loaded once and cropped per view")
+    sheet_packed_image: bpy.props.PointerProperty(type=bpy.types.Image, name="Packed Sheet",
+                                                  description="Optimised packed copy of the turnaround sheet")
+    textured_solid: bpy.props.BoolProperty(name="Textured Solid View", default=True,
+                                           description="Switch Solid shading of the view to Texture colour when spawning "
+                                                       "sheet crops, which otherwise show as blank planes")
 
     front:  bpy.props.PointerProperty(type=OrthoImageSettings)
     back:   bpy.props.PointerProperty(type=OrthoImageSettings)
@@ -160,19 +521,213 @@ class GridSettings(bpy.types.PropertyGroup):
         description="Color of grid lines"
     )
     show_grid: bpy.props.BoolProperty(name="Show Grid", default=True, description="Display grid lines")
+    snap_to_images: bpy.props.BoolProperty(name="Snap to Images", default=True,
+                                           description="Snap to the edges and centres of other references")
+    snap_distance: bpy.props.FloatProperty(name="Snap Distance", default=8.0, min=1.0, max=50.0,
+                                           description="Screen distance in pixels at which edges snap")
+
+
+# ── Board-level pan / zoom of the overlay layer ────────────────────────
+class BoardView(bpy.types.PropertyGroup):
+    offset: bpy.props.FloatVectorProperty(name="Pan", size=2, default=(0.0, 0.0),
+                                          update=lambda s, c: redraw(c))
+    zoom:   bpy.props.FloatProperty(name="Zoom", default=1.0, min=0.05, max=20.0,
+                                    update=lambda s, c: redraw(c))
+
 
+# ── Named arrangement of the board ─────────────────────────────────────
+# The per-reference columns live as ID-property arrays on the preset
+# (see LAYOUT_COLUMNS), so a 2,000-image layout is a handful of blocks.
+class BRefLayoutPreset(bpy.types.PropertyGroup):
+    name: bpy.props.StringProperty(name="Name", default="Layout")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Overlay helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _view(scn):
+    """Return the board pan offset and zoom as plain floats"""
+    v = scn.bref_view
+    return v.offset[0], v.offset[1], v.zoom
+
+
+def to_board(scn, x, y):
+    """Map a region pixel to board coordinates"""
+    ox, oy, z = _view(scn)
+    return Vector(((x - ox) / z, (y - oy) / z))
+
+
+_CULL_COLUMNS = (("x", np.float32), ("y", np.float32), ("width", np.float32),
+                 ("height", np.float32), ("layer", np.int32), ("visible", np.bool_))
+
+
+def board_columns(col):
+    """Rect, layer and visibility of every item as numpy arrays
+
+    Read with foreach_get only after one of them changed, so culling a large
+    board is a few vector ops per redraw instead of six RNA reads per item.
+    """
+    key = (col.id_data.as_pointer(), len(col), _board_generation)
+    if _board_cache[0] != key:
+        cols = {}
+        for name, dtype in _CULL_COLUMNS:
+            cols[name] = np.empty(len(col), dtype=dtype)
+            col.foreach_get(name, cols[name])
+        _board_cache[:] = key, cols
+    return _board_cache[1]
+
+
+def visible_indices(col, width, height, ox, oy, z, layer=None, top_first=False):
+    """Indices of the shown items overlapping the region, ordered by layer
+
+    layer limits the result to one layer; ties keep collection order.
+    """
+    c = board_columns(col)
+    x0, y0 = c["x"] * z + ox, c["y"] * z + oy
+    keep = (c["visible"] & (x0 < width) & (y0 < height) &
+            (x0 + c["width"] * z > 0) & (y0 + c["height"] * z > 0))
+    if layer is not None:
+        keep &= c["layer"] == layer
+    idx = np.flatnonzero(keep)
+    layers = c["layer"][idx]
+    return idx[np.argsort(-layers if top_first else layers, kind='stable')].tolist()
+
+
+class EdgeIndex:
+    """Sorted left / centre / right and bottom / centre / top coordinates
+
+    Built once when a drag starts, then queried with bisect on every mouse
+    move, so snapping cost does not grow with the number of references.
+    """
+
+    def __init__(self, items):
+        self.xs = sorted(v for it in items for v in (it.x, it.x + it.width * 0.5, it.x + it.width))
+        self.ys = sorted(v for it in items for v in (it.y, it.y + it.height * 0.5, it.y + it.height))
+
+    @staticmethod
+    def snap(values, candidates, tol):
+        """Shortest (shift, guide) that lands a candidate on an indexed value"""
+        best = None
+        for c in candidates:
+            i = bisect_left(values, c)
+            for v in values[max(0, i - 1):i + 1]:
+                d = v - c
+                if abs(d) <= tol and (best is None or abs(d) < abs(best[0])):
+                    best = (d, v)
+        return best
+
+
+def source_path(it, frame):
+    """File shown by the item at a scene frame"""
+    if it.source_type == 'SEQUENCE':
+        frames = sequence_frames(it.filepath)
+        return frames[sequence_index(it, frame, len(frames))]
+    return it.filepath
+
+
+def source_image(it):
+    """Packed copy the item shows instead of its file, if any"""
+    return it.packed_image if it.source_type == 'IMAGE' else None
+
+
+def crop_rect(it):
+    """(u0, v0, u1, v1) window of the texture the item shows"""
+    if not it.use_crop:
+        return 0.0, 0.0, 1.0, 1.0
+    (u0, v0), (u1, v1) = it.crop_min, it.crop_max
+    return min(u0, u1), min(v0, v1), max(u0, u1), max(v0, v1)
+
+
+def crop_uvs(it):
+    """Quad UVs for the item's rect, through its crop and flips"""
+    u0, v0, u1, v1 = crop_rect(it)
+    if it.flip_x:
+        u0, u1 = u1, u0
+    if it.flip_y:
+        v0, v1 = v1, v0
+    return [(u0, v0), (u1, v0), (u1, v1), (u0, v1)]
+
+
+def _uv_at(p, it):
+    """Texture UV under board point p, honouring flips and crop"""
+    fx = (p.x - it.x) / it.width if it.width else 0.0
+    fy = (p.y - it.y) / it.height if it.height else 0.0
+    fx, fy = (1.0 - fx if it.flip_x else fx), (1.0 - fy if it.flip_y else fy)
+    u0, v0, u1, v1 = crop_rect(it)
+    return u0 + fx * (u1 - u0), v0 + fy * (v1 - v0)
+
+
+def _opaque_at(p, it):
+    """Alpha mask bit under board point p; True while no mask exists"""
+    mask = _mask_cache.get(it.filepath) if it.source_type == 'IMAGE' else None
+    if not mask:
+        return True
+    w, h, bits = mask
+    u, v = _uv_at(p, it)
+    i = min(max(int(v * h), 0), h - 1) * w + min(max(int(u * w), 0), w - 1)
+    return bool(bits[i >> 3] & (0x80 >> (i & 7)))
+
+
+def _hit(p, it):
+    """Inside the rect and over a non-transparent part of the image"""
+    return _inside(p, it) and _opaque_at(p, it)
+
+
+def crop_edge(it, edge, delta, start):
+    """Move one displayed edge of it by delta board units, trimming its crop
+
+    The texture keeps its on-screen scale, so the content under the other
+    edges stays put. start is (x, y, w, h, u0, v0, u1, v1) at drag start.
+    """
+    x, y, w, h, u0, v0, u1, v1 = start
+    horiz  = edge in {'LEFT', 'RIGHT'}
+    at_min = edge in {'LEFT', 'BOTTOM'}
+    pos, size, lo, hi = (x, w, u0, u1) if horiz else (y, h, v0, v1)
+    # A crop typed in with min == max has no span to scale by; open it up
+    if hi - lo < 1e-4:
+        lo, hi = (lo, lo + 1e-4) if lo < 1.0 - 1e-4 else (hi - 1e-4, hi)
+
+    per_uv = size / (hi - lo)
+    shrink = (delta if at_min else -delta) / per_uv
+    min_span = 10.0 / per_uv
+    # Flipped images show their high UV bound on the low screen side
+    if at_min != (it.flip_x if horiz else it.flip_y):
+        lo = max(0.0, min(lo + shrink, hi - min_span))
+    else:
+        hi = min(1.0, max(hi - shrink, lo + min_span))
+    new_size = (hi - lo) * per_uv
+    if at_min:
+        pos += size - new_size
+
+    axis = 0 if horiz else 1
+    it.crop_min[axis], it.crop_max[axis] = lo, hi
+    # Set the whole rect last, crop updates may have touched it
+    if horiz:
+        it.x, it.y, it.width, it.height = pos, y, new_size, h
+    else:
+        it.x, it.y, it.width, it.height = x, pos, w, new_size
+
+
+def _nearest_edge(p, it):
+    return min((p.x - it.x, 'LEFT'), (it.x + it.width - p.x, 'RIGHT'),
+               (p.y - it.y, 'BOTTOM'), (it.y + it.height - p.y, 'TOP'))[1]
+
+
+def sample_color(it, p, frame):
+    """RGBA of the reference's pixel under board point p"""
+    px = image_pixels(source_path(it, frame), source_image(it))
+    h, w = px.shape[:2]
+    u, v = _uv_at(p, it)
+    return px[min(int(v * h), h - 1), min(int(u * w), w - 1)] / 255.0
+
+
 def _inside(p, it):
     return it.x <= p.x <= it.x + it.width and it.y <= p.y <= it.y + it.height
 
 
-def _corner(p, it):
-    corner_size = 30  # Size of the corner clickable area
+def _corner(p, it, corner_size=30):
+    # corner_size is the clickable area, in board units
 
     # Check all four corners
     # Bottom-right corner
@@ -197,12 +752,226 @@ def _corner(p, it):
 
     return False
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Image-sequence frame buffer
+# ─────────────────────────────────────────────────────────────────────────────
+
+def sequence_frames(filepath):
+    """Sorted sibling frames of a numbered file (``shot_0001.png`` …)"""
+    frames = _seq_files.get(filepath)
+    if frames is None:
+        folder, name = os.path.split(filepath)
+        m = re.match(r"^(.*?)(\d+)(\.[^.]+)$", name)
+        frames = []
+        if m and os.path.isdir(folder):
+            pat = re.compile(re.escape(m.group(1)) + r"(\d+)" + re.escape(m.group(3)) + "$")
+            found = sorted((int(f.group(1)), f.string) for f in map(pat.match, os.listdir(folder)) if f)
+            frames = [os.path.join(folder, n) for _, n in found]
+        _seq_files[filepath] = frames or [filepath]
+    return _seq_files[filepath]
+
+
+def sequence_index(it, frame, count):
+    """Map a scene frame to an index into the item's frame list"""
+    i = frame - it.frame_start + it.frame_offset
+    if it.use_cyclic:
+        return i % count
+    return max(0, min(i, count - 1))
+
+
+class FrameRing:
+    """Bounded buffer of decoded frames around the playhead of one sequence
+
+    Image datablocks are recycled between frames instead of being created and
+    removed each time, and frames still in the ring are never decoded again
+    while scrubbing back and forth.
+    """
+
+    def __init__(self, filepath, capacity):
+        self.filepath = filepath
+        self.capacity = max(2, capacity)
+        self.frames   = OrderedDict()   # frame index -> (img, tex)
+        self.free     = []              # recycled image datablocks
+        self.bad      = set()           # indices that failed to decode
+        self.head     = 0               # index wanted by the last draw
+        self.step     = 1               # playback direction
+        self.cyclic   = False           # wrap past the last frame, set by the draw
+
+    def get(self, index):
+        if index != self.head:
+            self.step = -1 if index < self.head else 1
+            self.head = index
+        hit = self.frames.get(index)
+        if hit:
+            self.frames.move_to_end(index)
+            return hit[1]
+        if not self.frames:
+            return None
+        # Not decoded yet – show the closest buffered frame rather than block
+        near = min(self.frames, key=lambda i: abs(i - index))
+        return self.frames[near][1]
+
+    def wanted(self, count):
+        """Frame indices that should be buffered, nearest first"""
+        ahead = (self.head + n * self.step for n in range(min(self.capacity, count)))
+        if self.cyclic:
+            ahead = (i % count for i in ahead)
+        else:
+            # Nothing past either end will ever be shown
+            ahead = (i for i in ahead if 0 <= i < count)
+        return [i for i in dict.fromkeys(ahead) if i not in self.frames and i not in self.bad]
+
+    def decode(self, index, path):
+        while len(self.frames) >= self.capacity:
+            _, (img, tex) = self.frames.popitem(last=False)
+            _release(tex)
+            self.free.append(img)
+        img = self.free.pop() if self.free else None
+        try:
+            if img:
+                img.filepath = path
+                img.reload()
+            else:
+                img = bpy.data.images.load(path, check_existing=False)
+                img.name = ".BRef_seq"
+            self.frames[index] = (img, upload_texture(img))
+        except ReferenceError:
+            # A recycled datablock that no longer exists; forget it, retry fresh
+            pass
+        except Exception as e:
+            if img:
+                self.free.append(img)
+            self.bad.add(index)
+            print(f"Failed to load frame {path}: {e}")
+
+    def release(self):
+        for img, tex in self.frames.values():
+            _release(tex)
+            self.free.append(img)
+        self.frames.clear()
+        for img in self.free:
+            try:
+                bpy.data.images.remove(img)
+            except Exception:
+                pass
+        self.free.clear()
+
+
+def _release(tex):
+    try:
+        tex.release()
+    except Exception:
+        pass
+
+
+def release_sequence(filepath):
+    ring = _seq_rings.pop(filepath, None)
+    if ring:
+        ring.release()
+    _seq_files.pop(filepath, None)
+
+
+def sequence_texture(it, frame):
+    """Texture for the item's current frame; never decodes inside the draw"""
+    frames = sequence_frames(it.filepath)
+    ring = _seq_rings.get(it.filepath)
+    if ring is None:
+        ring = _seq_rings[it.filepath] = FrameRing(it.filepath, bpy.context.scene.bref_frame_buffer)
+    ring.cyclic = it.use_cyclic
+    tex = ring.get(sequence_index(it, frame, len(frames)))
+    if ring.wanted(len(frames)) and not bpy.app.timers.is_registered(_prefetch_tick):
+        bpy.app.timers.register(_prefetch_tick)
+    return tex
+
+
+def _prefetch_tick():
+    """Decode a few frames ahead of each playhead, between redraws"""
+    budget = PREFETCH_PER_TICK
+    for fp, ring in list(_seq_rings.items()):
+        frames = sequence_frames(fp)
+        for i in ring.wanted(len(frames))[:budget]:
+            ring.decode(i, frames[i])
+            budget -= 1
+    if budget == PREFETCH_PER_TICK:
+        return None  # Every ring is full, stop until the next draw asks again
+    redraw(bpy.context)
+    return 0.0
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Orthographic Operators
 # ─────────────────────────────────────────────────────────────────────────────
 
 
 
+# ── Sheet crops: a UV-mapped plane per view, sharing one image ─────────
+def _crop_material(name, img, alpha):
+    mat = bpy.data.materials.get(name) or bpy.data.materials.new(name)
+    mat.use_nodes = True
+    nodes, links = mat.node_tree.nodes, mat.node_tree.links
+    nodes.clear()
+
+    tex   = nodes.new('ShaderNodeTexImage')
+    emit  = nodes.new('ShaderNodeEmission')
+    clear = nodes.new('ShaderNodeBsdfTransparent')
+    fade  = nodes.new('ShaderNodeMath')
+    mix   = nodes.new('ShaderNodeMixShader')
+    out   = nodes.new('ShaderNodeOutputMaterial')
+
+    tex.image = img
+    tex.extension = 'CLIP'
+    # Solid mode's Texture colour shows the active image node
+    nodes.active = tex
+    fade.operation = 'MULTIPLY'
+    fade.inputs[1].default_value = alpha
+    links.new(tex.outputs["Color"], emit.inputs["Color"])
+    links.new(tex.outputs["Alpha"], fade.inputs[0])
+    links.new(fade.outputs[0], mix.inputs["Fac"])
+    links.new(clear.outputs[0], mix.inputs[1])
+    links.new(emit.outputs[0], mix.inputs[2])
+    links.new(mix.outputs[0], out.inputs["Surface"])
+
+    if hasattr(mat, "surface_render_method"):
+        mat.surface_render_method = 'BLENDED'
+    else:
+        mat.blend_method = 'BLEND'
+    mat.diffuse_color = (1, 1, 1, alpha)
+    return mat
+
+
+def _build_crop_plane(mesh, img, settings):
+    """Rebuild *mesh* as a plane showing the crop of *img* set on *settings*"""
+    (u0, v0), (u1, v1) = settings.crop_min, settings.crop_max
+    u0, u1 = sorted((u0, u1))
+    v0, v1 = sorted((v0, v1))
+    w = max(img.size[0] * (u1 - u0), 1.0)
+    h = max(img.size[1] * (v1 - v0), 1.0)
+
+    # Longest side matches settings.size, like image empties
+    sx = settings.size * 0.5 * (w / max(w, h))
+    sy = settings.size * 0.5 * (h / max(w, h))
+
+    mesh.clear_geometry()
+    mesh.from_pydata([(-sx, -sy, 0), (sx, -sy, 0), (sx, sy, 0), (-sx, sy, 0)], [], [(0, 1, 2, 3)])
+    uv = mesh.uv_layers.new(name="UVMap")
+    for loop, co in zip(uv.data, ((u0, v0), (u1, v0), (u1, v1), (u0, v1))):
+        loop.uv = co
+
+    mesh.materials.clear()
+    mesh.materials.append(_crop_material(mesh.name, img, settings.alpha))
+
+
+def _remove_ortho_object(obj):
+    """Delete an ortho ref object along with the mesh / material it owns"""
+    mesh = obj.data if obj.type == 'MESH' else None
+    bpy.data.objects.remove(obj, do_unlink=True)
+    if mesh:
+        for mat in mesh.materials:
+            if mat:
+                bpy.data.materials.remove(mat)
+        bpy.data.meshes.remove(mesh)
+
+
 # ── Operator to spawn / update ortho refs ───────────────────────────────
 class ORTHO_OT_spawn_references(bpy.types.Operator):
     bl_idname = "bref.spawn_ortho_refs"
@@ -214,39 +983,63 @@ class ORTHO_OT_spawn_references(bpy.types.Operator):
             self.report({'INFO'}, "Orthographic references are disabled.")
             return {'CANCELLED'}
 
-        made = 0
+        made = planes = 0
         for key, obj_name in _ORTHO_EMPTY_NAMES.items():
             settings = getattr(ortho, key.lower())      # OrthoImageSettings
-            if not settings.filepath:
-                if (obj := bpy.data.objects.get(obj_name)):
-                    bpy.data.objects.remove(obj, do_unlink=True)
+            use_sheet = settings.use_sheet and bool(ortho.sheet_filepath)
+            path = ortho.sheet_filepath if use_sheet else settings.filepath
+            packed = ortho.sheet_packed_image if use_sheet else settings.packed_image
+            obj = bpy.data.objects.get(obj_name)
+            if not path:
+                if obj:
+                    _remove_ortho_object(obj)
                 continue
 
             try:
-                img = bpy.data.images.load(settings.filepath, check_existing=True)
+                # check_existing keeps every crop on the one sheet datablock
+                img = packed or bpy.data.images.load(path, check_existing=True)
             except Exception as e:
-                self.report({'WARNING'}, f"Failed to load {settings.filepath}: {e}")
+                self.report({'WARNING'}, f"Failed to load {path}: {e}")
                 continue
 
-            # get or create empty
-            obj = bpy.data.objects.get(obj_name) or bpy.data.objects.new(obj_name, None)
+            # get or create empty (full image) or plane (sheet crop)
+            if obj and obj.type != ('MESH' if use_sheet else 'EMPTY'):
+                _remove_ortho_object(obj)
+                obj = None
+            if use_sheet:
+                obj = obj or bpy.data.objects.new(obj_name, bpy.data.meshes.new(obj_name))
+            else:
+                obj = obj or bpy.data.objects.new(obj_name, None)
             if obj.name not in ctx.collection.objects:
                 ctx.collection.objects.link(obj)
 
-            obj.empty_display_type = 'IMAGE'
-            obj.empty_image_depth  = 'FRONT'
-            obj.data               = img
+            obj.show_in_front = True   # like empty_image_depth='FRONT'
+            if use_sheet:
+                _build_crop_plane(obj.data, img, settings)
+                obj.hide_render = True
+                planes += 1
+            else:
+                obj.empty_display_type = 'IMAGE'
+                obj.empty_image_depth  = 'FRONT'
+                obj.data               = img
+                obj.empty_display_size = settings.size
+
+                if hasattr(obj, "empty_image_opacity"):
+                    obj.empty_image_opacity = settings.alpha
+                else:
+                    obj.color = (1, 1, 1, settings.alpha)
+
             obj.rotation_euler     = _ORTHO_DATA[key]["rot"]
             obj.location           = _ORTHO_DATA[key]["loc"](ortho.offset)
-            obj.empty_display_size = settings.size
-
-            if hasattr(obj, "empty_image_opacity"):
-                obj.empty_image_opacity = settings.alpha
-            else:
-                obj.color = (1, 1, 1, settings.alpha)
 
             made += 1
 
+        # Crop planes are materials: in Solid / Material colour they are blank
+        space = ctx.space_data
+        if planes and ortho.textured_solid and space and space.type == 'VIEW_3D':
+            if space.shading.type == 'SOLID':
+                space.shading.color_type = 'TEXTURE'
+
         self.report({'INFO'}, f"{made} orthographic reference(s) active.")
         return {'FINISHED'}
 
@@ -263,7 +1056,7 @@ class ORTHO_OT_clear_references(bpy.types.Operator):
         for name in _ORTHO_EMPTY_NAMES.values():
             obj = bpy.data.objects.get(name)
             if obj:
-                bpy.data.objects.remove(obj, do_unlink=True)
+                _remove_ortho_object(obj)
                 removed += 1
         self.report({'INFO'}, f"Removed {removed} orthographic reference(s).")
         return {'FINISHED'}
@@ -272,52 +1065,273 @@ class ORTHO_OT_clear_references(bpy.types.Operator):
 # UIList – draggable overlay list
 # ─────────────────────────────────────────────────────────────────────────────
 
+def preview_icon(filepath):
+    """icon_id of the file's thumbnail, 0 while it is still queued
+
+    Nothing is decoded here: the file is queued and _preview_tick hands a few
+    per tick to bpy.utils.previews, whose deferred loader builds the
+    thumbnail in a background job (or takes it from the on-disk thumbnail
+    cache), so drawing the list never waits on an image.
+    """
+    if _previews is None or not filepath:
+        return 0
+    preview = _previews.get(filepath)
+    if preview is not None:
+        return preview.icon_id
+    if filepath not in _preview_queue and os.path.isfile(filepath):
+        _preview_queue.append(filepath)
+        if not bpy.app.timers.is_registered(_preview_tick):
+            bpy.app.timers.register(_preview_tick, first_interval=0.05)
+    return 0
+
+
+def _preview_tick():
+    if _previews is None:
+        return None
+    for fp in _preview_queue[:PREVIEWS_PER_TICK]:
+        if fp not in _previews:
+            _previews.load(fp, fp, 'IMAGE')
+    del _preview_queue[:PREVIEWS_PER_TICK]
+    for w in bpy.context.window_manager.windows:
+        for a in w.screen.areas:
+            if a.type == 'VIEW_3D':
+                for r in a.regions:
+                    if r.type == 'UI':
+                        r.tag_redraw()
+    return 0.1 if _preview_queue else None
+
+
+def _tokens(text):
+    return [t for t in re.split(r"[\s,;_.\-]+", text.lower()) if t]
+
+
+class SearchIndex:
+    """Inverted index from file-name and tag words to list positions
+
+    Words are kept sorted so a query word matches every indexed word it
+    prefixes with two bisects. Results and the alphabetical order are cached
+    until the collection changes and a new index is built.
+    """
+
+    def __init__(self, col):
+        postings, names = {}, []
+        for i, it in enumerate(col):
+            names.append(os.path.basename(it.filepath).lower())
+            # Extensions would make every PNG match "p"
+            stem = os.path.splitext(names[-1])[0]
+            for word in set(_tokens(stem) + _tokens(it.tags)):
+                postings.setdefault(word, []).append(i)
+        self.size    = len(names)
+        self.words   = sorted(postings)
+        self.posting = [postings[w] for w in self.words]
+        self._flags  = {}
+
+        # neworder for template_list: alphabetical rank of each item
+        self.alpha_order = [0] * self.size
+        for rank, i in enumerate(sorted(range(self.size), key=names.__getitem__)):
+            self.alpha_order[i] = rank
+
+    def match(self, query):
+        """Positions matching every word of query, None for an empty query"""
+        result = None
+        for word in _tokens(query):
+            lo = bisect_left(self.words, word)
+            hi = bisect_left(self.words, word + "\uffff")
+            hits = set().union(*self.posting[lo:hi])
+            result = hits if result is None else result & hits
+            if not result:
+                break
+        return result
+
+    def flags(self, query, bitflag):
+        key = (query, bitflag)
+        if key not in self._flags:
+            hits = self.match(query)
+            self._flags[key] = [] if hits is None else \
+                [bitflag if i in hits else 0 for i in range(self.size)]
+        return self._flags[key]
+
+
+def search_index(col):
+    key = (col.id_data.as_pointer(), len(col), _index_generation)
+    if _search_index[0] != key:
+        _search_index[:] = key, SearchIndex(col)
+    return _search_index[1]
+
+
+@persistent
+def _invalidate_index(*_):
+    # Undo and file loads swap the whole collection under us
+    global _index_generation, _board_generation
+    _index_generation += 1
+    _board_generation += 1
+
+
 class IMAGE_UL_draggable(bpy.types.UIList):
     def draw_item(self, _, layout, __, it, ___, ____, _____, ______):
         row = layout.row(align=True)
+        row.prop(it, "visible", text="", emboss=False,
+                 icon='HIDE_OFF' if it.visible else 'HIDE_ON')
         row.prop(it, "layer", text="", emboss=True)
         row.prop(it, "alpha", text="", slider=True)
         filename = os.path.basename(it.filepath) or "⟡"
-        row.label(text=filename, icon='IMAGE_DATA')
+        if it.duplicate_of:
+            row.label(text=filename, icon='DUPLICATE')
+        elif icon := preview_icon(it.filepath):
+            row.label(text=filename, icon_value=icon)
+        else:
+            row.label(text=filename, icon='IMAGE_DATA')
+
+    def filter_items(self, _, data, propname):
+        index = search_index(getattr(data, propname))
+        flags = index.flags(self.filter_name, self.bitflag_filter_item) if self.filter_name else []
+        order = index.alpha_order if self.use_filter_sort_alpha else []
+        return flags, order
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Overlay Operators
 # ─────────────────────────────────────────────────────────────────────────────
 
+def add_reference(col, filepath, upload=True):
+    """Append filepath to col sized from its image, return the new item
+
+    With upload=False no GPU texture is made, which is what background mode
+    needs; draw_cb uploads lazily once the board is opened with a UI.
+    """
+    # Load image first to verify it works
+    img = bpy.data.images.load(filepath, check_existing=True)
+
+    # Only add to collection if image loaded successfully
+    it = col.add()
+    it.filepath = filepath
+    it.layer = len(col) - 1
+    it.width, it.height = img.size[0] / 2, img.size[1] / 2
+    it.size = max(it.width, it.height)
+    it.original_width = it.width
+    it.original_height = it.height
+    if upload:
+        # Create texture safely, after size is read so a GPU-only
+        # upload does not get decoded straight back
+        schedule_mask(filepath, img)
+        _tex_cache[filepath] = (img, upload_texture(img))
+        _tex_seen[filepath] = time.monotonic()
+    return it
+
+
 class IMAGE_OT_add(bpy.types.Operator):
     bl_idname = "image.add_draggable"
     bl_label = "Add Reference Image(s)"
     files: bpy.props.CollectionProperty(type=bpy.types.OperatorFileListElement)
     directory: bpy.props.StringProperty(subtype='DIR_PATH')
     filter_image: bpy.props.BoolProperty(default=True, options={'HIDDEN'})
+    as_sequence: bpy.props.BoolProperty(
+        name="Image Sequence",
+        description="Add the selected numbered files as one reference that follows the scene frame",
+        default=False)
+    duplicates: bpy.props.EnumProperty(
+        name="Duplicates",
+        description="What to do with files that look like a reference already on the board",
+        items=[('SKIP',  "Skip",  "Do not add near-duplicates"),
+               ('MERGE', "Merge", "Keep one entry, switched to the higher-resolution file"),
+               ('FLAG',  "Flag",  "Add them, marked as duplicates in the list"),
+               ('KEEP',  "Keep",  "Add every file without checking")],
+        default='FLAG')
+    duplicate_threshold: bpy.props.IntProperty(
+        name="Tolerance",
+        description="Differing bits (of 64) in the perceptual hash still counted as the same image",
+        default=6, min=0, max=24)
+
+    @staticmethod
+    def _hash(filepath):
+        try:
+            return perceptual_hash(filepath)
+        except Exception as e:
+            print(f"BRef: could not hash {filepath}: {e}")
+            return None
+
+    @staticmethod
+    def _merge(it, filepath):
+        """Point it at filepath if that file has more pixels, keeping its rect
+
+        Returns whether it was switched.
+        """
+        img = bpy.data.images.load(filepath, check_existing=True)
+        if img.size[0] * img.size[1] <= it.original_width * it.original_height * 4:
+            return False
+        old = it.filepath
+        it.filepath = filepath
+        it.original_width, it.original_height = img.size[0] / 2, img.size[1] / 2
+        if old in _tex_cache and not any(o.filepath == old for o in bpy.context.scene.draggable_images):
+            _release(_tex_cache.pop(old)[1])
+            _mask_cache.pop(old, None)
+        return True
 
     def execute(self, ctx):
         col = ctx.scene.draggable_images
-        added_count = 0
+        added_count = skipped = merged = flagged = 0
 
         # Get all selected files
         filepaths = [os.path.join(self.directory, f.name) for f in self.files]
+        if self.as_sequence:
+            # The first frame stands for the whole sequence
+            filepaths = sorted(filepaths)[:1]
+
+        # Perceptual hashes of what is already on the board
+        dedupe = self.duplicates != 'KEEP' and not self.as_sequence
+        known_hashes, known_items = [], []
+        if dedupe:
+            for i, o in enumerate(col):
+                if o.source_type != 'IMAGE':
+                    continue
+                if not o.phash and os.path.isfile(o.filepath):
+                    # Only entries from before hashes were stored get decoded
+                    if (h := self._hash(o.filepath)) is not None:
+                        o.phash = f"{h:016x}"
+                if o.phash:
+                    known_hashes.append(int(o.phash, 16))
+                    known_items.append(i)
 
         # Process each file
         for filepath in filepaths:
             if not os.path.isfile(filepath):
                 continue
 
-            try:
-                # Load image first to verify it works
-                img = bpy.data.images.load(filepath, check_existing=True)
-
-                # Only add to collection if image loaded successfully
-                it = col.add()
-                it.filepath = filepath
-                it.layer = len(col) - 1
+            h = match = None
+            if dedupe and (h := self._hash(filepath)) is not None and known_hashes:
+                dist = hash_distances(h, known_hashes)
+                j = int(dist.argmin())
+                if dist[j] <= self.duplicate_threshold:
+                    # Index only: add_reference() may reallocate col
+                    match = known_items[j]
+            if match is not None and self.duplicates == 'SKIP':
+                skipped += 1
+                continue
+            if match is not None and self.duplicates == 'MERGE':
+                try:
+                    if self._merge(col[match], filepath):
+                        col[match].phash = f"{h:016x}"
+                        known_hashes[j] = h
+                        merged += 1
+                    else:
+                        # The board already has the larger file, drop this one
+                        skipped += 1
+                except Exception as e:
+                    self.report({'ERROR'}, f"Error loading {os.path.basename(filepath)}: {str(e)}")
+                continue
 
-                # Create texture safely
-                _tex_cache[filepath] = (img, gpu.texture.from_image(img))
-                it.width, it.height = img.size[0] / 2, img.size[1] / 2
-                it.size = max(it.width, it.height)
-                it.original_width = it.width
-                it.original_height = it.height
+            try:
+                match_name = os.path.basename(col[match].filepath) if match is not None else ""
+                it = add_reference(col, filepath, upload=not self.as_sequence)
+                if match is not None:
+                    it.duplicate_of = match_name
+                    flagged += 1
+                if h is not None:
+                    it.phash = f"{h:016x}"
+                    known_hashes.append(h)
+                    known_items.append(len(col) - 1)
+                if self.as_sequence:
+                    it.source_type = 'SEQUENCE'
+                    it.frame_start = ctx.scene.frame_start
                 # Set the index to the newly added image
                 ctx.scene.drag_img_index = len(col) - 1
                 added_count += 1
@@ -333,7 +1347,10 @@ class IMAGE_OT_add(bpy.types.Operator):
                 self.report({'ERROR'}, f"Error loading {os.path.basename(filepath)}: {str(e)}")
                 continue
 
-        self.report({'INFO'}, f"Added {added_count} reference image(s)")
+        msg = f"Added {added_count} reference image(s)"
+        if skipped or merged or flagged:
+            msg += f" • duplicates: {skipped} skipped, {merged} merged, {flagged} flagged"
+        self.report({'INFO'}, msg)
         redraw(ctx)
         return {'FINISHED'}
 
@@ -342,6 +1359,94 @@ class IMAGE_OT_add(bpy.types.Operator):
         return {'RUNNING_MODAL'}
 
 
+def arrange_images(images_to_arrange, all_images, viewport_width, viewport_height,
+                   size_reduction, origin=Vector((0, 0))):
+    """Place images_to_arrange inside a viewport-sized board area without overlap
+
+    Needs no region, so it also packs boards in background mode against a
+    virtual viewport; origin is the board position of the area's corner.
+    """
+    MAX_SIZE = min(viewport_width, viewport_height) * 0.3
+    PADDING = 20
+    LEFT_MARGIN = 20
+    TOP_MARGIN = 40
+
+    # Create a list of rectangle bounds for existing images that we're not arranging
+    existing_rects = []
+    for i, img in enumerate(all_images):
+        if img not in images_to_arrange:
+            x, y = img.x - origin.x, img.y - origin.y
+            existing_rects.append((x, y, x + img.width, y + img.height))
+
+    # First pass: apply user's size reduction if requested
+    for img in images_to_arrange:
+        if size_reduction > 0:
+            reduction_factor = 1.0 - size_reduction
+            orig_w, orig_h = img.original_width, img.original_height
+
+            # Only scale down if the original is too big
+            if orig_w > MAX_SIZE or orig_h > MAX_SIZE:
+                w_scale = MAX_SIZE / orig_w if orig_w > MAX_SIZE else 1.0
+                h_scale = MAX_SIZE / orig_h if orig_h > MAX_SIZE else 1.0
+                base_scale = min(w_scale, h_scale)
+            else:
+                base_scale = 1.0
+
+            final_scale = base_scale * reduction_factor
+
+            # Apply scaling from the original dims every time
+            img.width  = orig_w * final_scale
+            img.height = orig_h * final_scale
+            img.size   = max(img.width, img.height)
+
+    # Check if a position overlaps with any existing rectangle
+    def is_overlapping(x, y, w, h):
+        new_rect = (x, y, x + w, y + h)
+        for rect in existing_rects:
+            # Check if rectangles overlap
+            if not (new_rect[2] <= rect[0] or new_rect[0] >= rect[2] or
+                    new_rect[3] <= rect[1] or new_rect[1] >= rect[3]):
+                return True
+        return False
+
+    # Functions to find available space for images
+    def find_grid_position(img_width, img_height):
+        # Start from top left
+        current_x = LEFT_MARGIN
+        current_y = viewport_height - TOP_MARGIN - img_height
+
+        # Try positions in grid-like fashion until we find one without overlap
+        while current_y > 0:
+            if current_x + img_width > viewport_width - PADDING:
+                # Move to next row
+                current_x = LEFT_MARGIN
+                current_y -= (img_height + PADDING)
+                continue
+
+            # Check if this position would cause overlap
+            if not is_overlapping(current_x, current_y, img_width, img_height):
+                return current_x, current_y
+
+            # Move right
+            current_x += img_width + PADDING
+
+        # If no good position found, place at top left
+        return LEFT_MARGIN, viewport_height - TOP_MARGIN - img_height
+
+    # For each image we're arranging, find a position without overlap
+    for img in images_to_arrange:
+        # Find position for this image
+        x, y = find_grid_position(img.width, img.height)
+
+        # Ensure image stays within viewport
+        x = max(LEFT_MARGIN, min(x, viewport_width - img.width - PADDING))
+        y = max(PADDING, min(y, viewport_height - img.height - PADDING))
+        img.x, img.y = origin.x + x, origin.y + y
+
+        # Add this image to existing rectangles so subsequent images won't overlap it
+        existing_rects.append((x, y, x + img.width, y + img.height))
+
+
 class IMAGE_OT_smart_arrange(bpy.types.Operator):
     bl_idname = "image.smart_arrange"
     bl_label = "Smart Arrange"
@@ -377,12 +1482,10 @@ class IMAGE_OT_smart_arrange(bpy.types.Operator):
             self.report({'WARNING'}, "No 3D viewport found")
             return {'CANCELLED'}
 
-        viewport_width, viewport_height = region.width, region.height
-
-        MAX_SIZE = min(viewport_width, viewport_height) * 0.3
-        PADDING = 20
-        LEFT_MARGIN = 20
-        TOP_MARGIN = 40
+        # Arrange inside the part of the board that is currently on screen
+        zoom = ctx.scene.bref_view.zoom
+        origin = to_board(ctx.scene, 0, 0)
+        viewport_width, viewport_height = region.width / zoom, region.height / zoom
 
         # Get user's size reduction preference (0.0 = no reduction, higher values = more reduction)
         size_reduction = ctx.scene.arrange_settings.size_reduction
@@ -400,78 +1503,8 @@ class IMAGE_OT_smart_arrange(bpy.types.Operator):
         else:
             images_to_arrange = all_images
 
-        # Create a list of rectangle bounds for existing images that we're not arranging
-        existing_rects = []
-        for i, img in enumerate(all_images):
-            if img not in images_to_arrange:
-                existing_rects.append((img.x, img.y, img.x + img.width, img.y + img.height))
-
-        # First pass: apply user's size reduction if requested
-        for img in images_to_arrange:
-            if size_reduction > 0:
-                reduction_factor = 1.0 - size_reduction
-                orig_w, orig_h = img.original_width, img.original_height
-
-                # Only scale down if the original is too big
-                if orig_w > MAX_SIZE or orig_h > MAX_SIZE:
-                    w_scale = MAX_SIZE / orig_w if orig_w > MAX_SIZE else 1.0
-                    h_scale = MAX_SIZE / orig_h if orig_h > MAX_SIZE else 1.0
-                    base_scale = min(w_scale, h_scale)
-                else:
-                    base_scale = 1.0
-
-                final_scale = base_scale * reduction_factor
-
-                # Apply scaling from the original dims every time
-                img.width  = orig_w * final_scale
-                img.height = orig_h * final_scale
-                img.size   = max(img.width, img.height)
-
-        # Check if a position overlaps with any existing rectangle
-        def is_overlapping(x, y, w, h):
-            new_rect = (x, y, x + w, y + h)
-            for rect in existing_rects:
-                # Check if rectangles overlap
-                if not (new_rect[2] <= rect[0] or new_rect[0] >= rect[2] or
-                        new_rect[3] <= rect[1] or new_rect[1] >= rect[3]):
-                    return True
-            return False
-
-        # Functions to find available space for images
-        def find_grid_position(img_width, img_height):
-            # Start from top left
-            current_x = LEFT_MARGIN
-            current_y = viewport_height - TOP_MARGIN - img_height
-
-            # Try positions in grid-like fashion until we find one without overlap
-            while current_y > 0:
-                if current_x + img_width > viewport_width - PADDING:
-                    # Move to next row
-                    current_x = LEFT_MARGIN
-                    current_y -= (img_height + PADDING)
-                    continue
-
-                # Check if this position would cause overlap
-                if not is_overlapping(current_x, current_y, img_width, img_height):
-                    return current_x, current_y
-
-                # Move right
-                current_x += img_width + PADDING
-
-            # If no good position found, place at top left
-            return LEFT_MARGIN, viewport_height - TOP_MARGIN - img_height
-
-        # For each image we're arranging, find a position without overlap
-        for img in images_to_arrange:
-            # Find position for this image
-            img.x, img.y = find_grid_position(img.width, img.height)
-
-            # Ensure image stays within viewport
-            img.x = max(LEFT_MARGIN, min(img.x, viewport_width - img.width - PADDING))
-            img.y = max(PADDING, min(img.y, viewport_height - img.height - PADDING))
-
-            # Add this image to existing rectangles so subsequent images won't overlap it
-            existing_rects.append((img.x, img.y, img.x + img.width, img.y + img.height))
+        arrange_images(images_to_arrange, all_images, viewport_width, viewport_height,
+                       size_reduction, origin)
 
         count_str = "all" if self.arrange_all else "selected"
         self.report({'INFO'}, f"Arranged {count_str} images without overlapping")
@@ -488,6 +1521,53 @@ class ArrangeSettings(bpy.types.PropertyGroup):
         step=0.05
     )
 
+class IMAGE_OT_duplicate(bpy.types.Operator):
+    bl_idname, bl_label = "image.duplicate_draggable", "Duplicate Image"
+    bl_description = "Add another entry for the selected reference, sharing its texture (e.g. to show a different crop)"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, ctx):
+        return ctx.scene.draggable_images and 0 <= ctx.scene.drag_img_index < len(ctx.scene.draggable_images)
+    def execute(self, ctx):
+        col = ctx.scene.draggable_images
+        dst = col.add()
+        # Fetch src after add(): growing col may reallocate its items
+        src = col[ctx.scene.drag_img_index]
+        for prop in src.bl_rna.properties:
+            name = prop.identifier
+            if name == "rna_type" or prop.is_readonly:
+                continue
+            if name == "source_type":
+                # Written raw: _cb_source would release the frames src is showing
+                dst["source_type"] = prop.enum_items[src.source_type].value
+                continue
+            value, current = getattr(src, name), getattr(dst, name)
+            if getattr(prop, "is_array", False):
+                value, current = tuple(value), tuple(current)
+            # Only write what differs, so update callbacks fire as little as possible
+            if value != current:
+                setattr(dst, name, value)
+        # Callbacks above may have reshaped the rect, restore it last
+        dst.width, dst.height = src.width, src.height
+        dst.x, dst.y = src.x + 20, src.y - 20
+        dst.layer = max(it.layer for it in col) + 1
+        ctx.scene.drag_img_index = len(col) - 1
+        redraw(ctx)
+        return {'FINISHED'}
+
+
+class IMAGE_OT_clear_duplicate(bpy.types.Operator):
+    bl_idname, bl_label = "image.clear_duplicate_flag", "Not a Duplicate"
+    bl_description = "Clear the duplicate mark set on import"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, ctx):
+        return ctx.scene.draggable_images and 0 <= ctx.scene.drag_img_index < len(ctx.scene.draggable_images)
+    def execute(self, ctx):
+        ctx.scene.draggable_images[ctx.scene.drag_img_index].duplicate_of = ""
+        return {'FINISHED'}
+
+
 class IMAGE_OT_remove(bpy.types.Operator):
     bl_idname, bl_label = "image.remove_draggable", "Remove Image"
     @classmethod
@@ -500,11 +1580,270 @@ class IMAGE_OT_remove(bpy.types.Operator):
                 try: _tex_cache[fp][1].release()
                 except: pass
                 del _tex_cache[fp]
+                _mask_cache.pop(fp, None)
+            release_sequence(fp)
+            _pixel_cache.pop(fp, None)
             col.remove(idx)
             ctx.scene.drag_img_index = max(0, min(idx, len(col) - 1))
             redraw(ctx)
         return {'FINISHED'}
 
+def free_cpu_buffers():
+    """Drop the decoded pixels of every uploaded reference, return the count"""
+    freed = 0
+    images = [img for img, _ in _tex_cache.values()]
+    images += [img for ring in _seq_rings.values() for img, _ in ring.frames.values()]
+    for img in images:
+        try:
+            if img and img.has_data:
+                img.buffers_free()
+                freed += 1
+        except ReferenceError:
+            pass
+    return freed
+
+
+class IMAGE_OT_free_buffers(bpy.types.Operator):
+    bl_idname, bl_label = "image.free_reference_buffers", "Free CPU Buffers"
+    bl_description = "Release the decoded pixels of uploaded references from RAM, keeping their GPU textures"
+    def execute(self, ctx):
+        self.report({'INFO'}, f"Freed CPU buffers of {free_cpu_buffers()} image(s)")
+        redraw(ctx)
+        return {'FINISHED'}
+
+
+def _cb_residency(self, ctx):
+    if self.bref_gpu_only:
+        free_cpu_buffers()
+
+
+@persistent
+def _reset_caches(*_):
+    """Drop everything holding image datablocks before another file replaces them"""
+    for _, tex in _tex_cache.values():
+        if tex:
+            _release(tex)
+    _tex_cache.clear()
+    _tex_seen.clear()
+    for fp in list(_seq_rings):
+        release_sequence(fp)
+    _pixel_cache.clear()
+    _mask_cache.clear()
+    _mask_queue.clear()
+
+
+def evict_idle_textures(now, idle=TEX_IDLE_SECONDS):
+    """Release textures no viewport has drawn for idle seconds
+
+    Their images keep no CPU pixels either; draw_cb uploads them again if
+    they come back on screen.
+    """
+    for fp in [fp for fp, (_, tex) in _tex_cache.items()
+               if tex and now - _tex_seen.get(fp, 0.0) > idle]:
+        img, tex = _tex_cache.pop(fp)
+        _tex_seen.pop(fp, None)
+        _release(tex)
+        try:
+            if img.has_data:
+                img.buffers_free()
+        except ReferenceError:
+            pass
+
+
+def forget_texture(filepath):
+    """Drop the cached texture, mask and pixels so the next use loads them again"""
+    if filepath in _tex_cache:
+        _release(_tex_cache.pop(filepath)[1])
+    _mask_cache.pop(filepath, None)
+    _pixel_cache.pop(filepath, None)
+
+
+def pack_optimized(filepath, max_size, file_format, quality):
+    """Downscale and re-encode filepath, pack the result into the .blend
+
+    Returns the new packed image. Images with alpha are written as WebP even
+    when JPEG is asked for, so cut-outs keep their transparency.
+    """
+    src = bpy.data.images.load(filepath, check_existing=False)
+    try:
+        w, h = src.size
+        f = min(1.0, max_size / max(w, h, 1))
+        if f < 1.0:
+            src.scale(max(1, round(w * f)), max(1, round(h * f)))
+        if file_format == 'JPEG' and src.depth != 24:
+            file_format = 'WEBP'
+        ext = ".jpg" if file_format == 'JPEG' else ".webp"
+        tmp = os.path.join(bpy.app.tempdir, f"bref_pack_{abs(hash(filepath))}{ext}")
+        src.file_format = file_format
+        src.save(filepath=tmp, quality=quality)
+    finally:
+        bpy.data.images.remove(src)
+
+    try:
+        img = bpy.data.images.load(tmp, check_existing=False)
+        img.pack()
+        img.name = f"BRef_{os.path.splitext(os.path.basename(filepath))[0]}"
+    finally:
+        os.remove(tmp)
+    return img
+
+
+class IMAGE_OT_pack_optimized(bpy.types.Operator):
+    bl_idname, bl_label = "image.pack_optimized", "Pack Optimized"
+    bl_description = ("Pack downscaled, compressed copies of the references into the .blend. "
+                      "The original paths are kept for re-linking")
+    bl_options = {'REGISTER', 'UNDO'}
+
+    max_size: bpy.props.IntProperty(name="Max Resolution", default=2048, min=64, max=16384,
+                                    description="Longest side of the packed copy, in pixels")
+    file_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[('JPEG', "JPEG", "Smallest; images with alpha fall back to WebP"),
+               ('WEBP', "WebP", "Compressed, keeps alpha")],
+        default='JPEG')
+    quality: bpy.props.IntProperty(name="Quality", default=85, min=1, max=100, subtype='PERCENTAGE')
+    targets: bpy.props.EnumProperty(
+        name="References",
+        items=[('OVERLAY', "Overlay", "Viewport overlay references"),
+               ('ORTHO',   "Ortho",   "Orthographic references")],
+        options={'ENUM_FLAG'}, default={'OVERLAY', 'ORTHO'})
+
+    def execute(self, ctx):
+        scn, ortho = ctx.scene, ctx.scene.ortho_refs
+        # filepath -> setters that point a reference at the packed copy
+        owners = {}
+        if 'OVERLAY' in self.targets:
+            for it in scn.draggable_images:
+                if it.source_type == 'IMAGE' and it.filepath:
+                    owners.setdefault(it.filepath, []).append((it, "packed_image"))
+        if 'ORTHO' in self.targets:
+            for key in _ORTHO_EMPTY_NAMES:
+                view = getattr(ortho, key.lower())
+                if view.filepath:
+                    owners.setdefault(view.filepath, []).append((view, "packed_image"))
+            if ortho.sheet_filepath:
+                owners.setdefault(ortho.sheet_filepath, []).append((ortho, "sheet_packed_image"))
+
+        before = after = packed = 0
+        replaced = set()
+        for fp, refs in owners.items():
+            if not os.path.isfile(fp):
+                continue
+            try:
+                img = pack_optimized(fp, self.max_size, self.file_format, self.quality)
+            except Exception as e:
+                self.report({'WARNING'}, f"Could not pack {os.path.basename(fp)}: {e}")
+                continue
+            before += os.path.getsize(fp)
+            after  += img.packed_file.size
+            for owner, attr in refs:
+                if getattr(owner, attr):
+                    replaced.add(getattr(owner, attr))
+                setattr(owner, attr, img)
+            forget_texture(fp)
+            packed += 1
+
+        if ortho.enabled and 'ORTHO' in self.targets:
+            bpy.ops.bref.spawn_ortho_refs()
+        # Earlier packed copies, once nothing shows them any more
+        for old in replaced:
+            if old.users == 0:
+                bpy.data.images.remove(old)
+        self.report({'INFO'}, f"Packed {packed} image(s): {format_bytes(before)} → {format_bytes(after)}")
+        redraw(ctx)
+        return {'FINISHED'}
+
+    def invoke(self, ctx, _):
+        return ctx.window_manager.invoke_props_dialog(self)
+
+
+class IMAGE_OT_relink_originals(bpy.types.Operator):
+    bl_idname, bl_label = "image.relink_originals", "Re-link Originals"
+    bl_description = "Show the original files again and drop the optimised packed copies"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, ctx):
+        scn, ortho = ctx.scene, ctx.scene.ortho_refs
+        owners = [(it, "packed_image") for it in scn.draggable_images]
+        owners += [(getattr(ortho, key.lower()), "packed_image") for key in _ORTHO_EMPTY_NAMES]
+        owners.append((ortho, "sheet_packed_image"))
+
+        dropped = set()
+        for owner, attr in owners:
+            img = getattr(owner, attr)
+            if img:
+                dropped.add(img)
+                setattr(owner, attr, None)
+                forget_texture(getattr(owner, "filepath", ""))
+        if ortho.enabled:
+            bpy.ops.bref.spawn_ortho_refs()
+        for img in dropped:
+            if img.users == 0:
+                bpy.data.images.remove(img)
+        self.report({'INFO'}, f"Re-linked {len(dropped)} original image(s)")
+        redraw(ctx)
+        return {'FINISHED'}
+
+
+class IMAGE_OT_extract_palette(bpy.types.Operator):
+    bl_idname, bl_label = "image.extract_palette", "Extract Palette"
+    bl_description = "Cluster the selected reference's colours into the BRef palette"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    colors: bpy.props.IntProperty(name="Colors", default=6, min=2, max=16)
+    sample_size: bpy.props.IntProperty(name="Sample Size", default=128, min=16, max=512,
+                                       description="Longest side of the downsampled copy that is clustered")
+
+    @classmethod
+    def poll(cls, ctx):
+        return ctx.scene.draggable_images and 0 <= ctx.scene.drag_img_index < len(ctx.scene.draggable_images)
+
+    def execute(self, ctx):
+        it = ctx.scene.draggable_images[ctx.scene.drag_img_index]
+        try:
+            px = decode_small(source_path(it, ctx.scene.frame_current), self.sample_size,
+                              image=source_image(it))
+        except Exception as e:
+            self.report({'ERROR'}, f"Could not read {os.path.basename(it.filepath)}: {e}")
+            return {'CANCELLED'}
+
+        # Only the part of the image the overlay shows
+        h, w = px.shape[:2]
+        u0, v0, u1, v1 = crop_rect(it)
+        px = px[int(v0 * h):max(int(v0 * h) + 1, math.ceil(v1 * h)),
+                int(u0 * w):max(int(u0 * w) + 1, math.ceil(u1 * w))].reshape(-1, 4)
+
+        # Transparent pixels would pull every cluster towards black
+        points = px[px[:, 3] > 0.5, :3]
+        if not len(points):
+            self.report({'WARNING'}, "Image has no opaque pixels")
+            return {'CANCELLED'}
+        centres, counts = kmeans(points, self.colors)
+
+        palette = bpy.data.palettes.get("BRef Palette") or bpy.data.palettes.new("BRef Palette")
+        palette.colors.clear()
+        for i in np.argsort(-counts):
+            if counts[i]:
+                palette.colors.new().color = centres[i].clip(0.0, 1.0)
+        self.report({'INFO'}, f"Extracted {len(palette.colors)} colour(s)")
+        return {'FINISHED'}
+
+
+class IMAGE_OT_reset_adjustments(bpy.types.Operator):
+    bl_idname, bl_label = "image.reset_adjustments", "Reset Adjustments"
+    bl_options = {'REGISTER', 'UNDO'}
+    @classmethod
+    def poll(cls, ctx):
+        return ctx.scene.draggable_images and 0 <= ctx.scene.drag_img_index < len(ctx.scene.draggable_images)
+    def execute(self, ctx):
+        it = ctx.scene.draggable_images[ctx.scene.drag_img_index]
+        for name in ("grayscale", "invert", "contrast", "exposure", "tint",
+                     "use_silhouette", "silhouette_threshold"):
+            it.property_unset(name)
+        redraw(ctx)
+        return {'FINISHED'}
+
+
 class IMAGE_OT_move_layer(bpy.types.Operator):
     bl_idname, bl_label = "image.move_draggable_layer", "Move Layer"
     direction: bpy.props.EnumProperty(items=[("UP","Up",""),("DOWN","Down","")])
@@ -525,10 +1864,156 @@ class IMAGE_OT_reset_position(bpy.types.Operator):
                     for r in a.regions if r.type == 'WINDOW'), None)
         if reg:
             it = ctx.scene.draggable_images[ctx.scene.drag_img_index]
-            it.x, it.y = reg.width / 2 - it.width / 2, reg.height / 2 - it.height / 2
+            c = to_board(ctx.scene, reg.width / 2, reg.height / 2)
+            it.x, it.y = c.x - it.width / 2, c.y - it.height / 2
             redraw(ctx)
         return {'FINISHED'}
 
+
+class IMAGE_OT_reset_view(bpy.types.Operator):
+    bl_idname, bl_label = "image.reset_board_view", "Reset Board View"
+    bl_description = "Reset the pan and zoom of the overlay board"
+    def execute(self, ctx):
+        v = ctx.scene.bref_view
+        v.offset, v.zoom = (0.0, 0.0), 1.0
+        redraw(ctx)
+        return {'FINISHED'}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Layout presets
+# ─────────────────────────────────────────────────────────────────────────────
+# (property, numpy dtype) stored per reference; size mirrors width for the UI
+LAYOUT_COLUMNS = (
+    ("x", np.float32), ("y", np.float32), ("size", np.float32),
+    ("width", np.float32), ("height", np.float32),
+    ("layer", np.int32), ("alpha", np.float32), ("visible", np.bool_),
+)
+
+
+def layout_columns(col):
+    """Every LAYOUT_COLUMNS property of col as one numpy array each"""
+    out = {}
+    for name, dtype in LAYOUT_COLUMNS:
+        arr = np.empty(len(col), dtype=dtype)
+        col.foreach_get(name, arr)
+        out[name] = arr
+    return out
+
+
+def store_layout(preset, col):
+    preset["paths"] = "\n".join(it.filepath for it in col)
+    for name, arr in layout_columns(col).items():
+        preset[name] = arr.tolist()
+
+
+def apply_layout(preset, col):
+    """Write preset onto col with one foreach_set per column
+
+    Rows are matched by file path, so references added or removed since the
+    preset was stored keep their current values. Returns the matched count.
+    """
+    stored = preset.get("paths", "").split("\n")
+    current = [it.filepath for it in col]
+    if stored == current:
+        dst = src = slice(None)
+        matched = len(current)
+    else:
+        rows = {}
+        for i, fp in enumerate(stored):
+            rows.setdefault(fp, []).append(i)
+        pairs = [(i, rows[fp].pop(0)) for i, fp in enumerate(current) if rows.get(fp)]
+        if not pairs:
+            return 0
+        dst, src = map(list, zip(*pairs))
+        matched = len(pairs)
+
+    columns = layout_columns(col)
+    for name, dtype in LAYOUT_COLUMNS:
+        if name not in preset:
+            continue
+        arr = columns[name]
+        arr[dst] = np.asarray(preset[name], dtype=dtype)[src]
+        col.foreach_set(name, arr)
+    # foreach_set skips update callbacks, so invalidate the cull columns here
+    global _board_generation
+    _board_generation += 1
+    return matched
+
+
+class IMAGE_OT_layout_preset_add(bpy.types.Operator):
+    bl_idname, bl_label = "image.layout_preset_add", "Save Layout"
+    bl_description = "Store the position, size, layer, opacity and visibility of every reference as a preset"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    name: bpy.props.StringProperty(name="Name", default="Layout")
+
+    @classmethod
+    def poll(cls, ctx):
+        return bool(ctx.scene.draggable_images)
+
+    def execute(self, ctx):
+        scn = ctx.scene
+        preset = scn.bref_layout_presets.add()
+        preset.name = self.name
+        store_layout(preset, scn.draggable_images)
+        scn.bref_layout_preset_index = len(scn.bref_layout_presets) - 1
+        return {'FINISHED'}
+
+
+class IMAGE_OT_layout_preset_update(bpy.types.Operator):
+    bl_idname, bl_label = "image.layout_preset_update", "Overwrite Layout"
+    bl_description = "Replace the selected preset with the current layout"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, ctx):
+        scn = ctx.scene
+        return scn.draggable_images and 0 <= scn.bref_layout_preset_index < len(scn.bref_layout_presets)
+
+    def execute(self, ctx):
+        scn = ctx.scene
+        store_layout(scn.bref_layout_presets[scn.bref_layout_preset_index], scn.draggable_images)
+        return {'FINISHED'}
+
+
+class IMAGE_OT_layout_preset_apply(bpy.types.Operator):
+    bl_idname, bl_label = "image.layout_preset_apply", "Apply Layout"
+    bl_description = "Move every reference to the selected layout preset"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, ctx):
+        scn = ctx.scene
+        return scn.draggable_images and 0 <= scn.bref_layout_preset_index < len(scn.bref_layout_presets)
+
+    def execute(self, ctx):
+        scn = ctx.scene
+        preset = scn.bref_layout_presets[scn.bref_layout_preset_index]
+        matched = apply_layout(preset, scn.draggable_images)
+        if not matched:
+            self.report({'WARNING'}, f"No reference of '{preset.name}' is on the board")
+            return {'CANCELLED'}
+        if matched < len(scn.draggable_images):
+            self.report({'INFO'}, f"'{preset.name}' covers {matched} of {len(scn.draggable_images)} references")
+        redraw(ctx)
+        return {'FINISHED'}
+
+
+class IMAGE_OT_layout_preset_remove(bpy.types.Operator):
+    bl_idname, bl_label = "image.layout_preset_remove", "Remove Layout"
+    bl_description = "Delete the selected layout preset"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, ctx):
+        return 0 <= ctx.scene.bref_layout_preset_index < len(ctx.scene.bref_layout_presets)
+
+    def execute(self, ctx):
+        scn = ctx.scene
+        scn.bref_layout_presets.remove(scn.bref_layout_preset_index)
+        scn.bref_layout_preset_index = min(scn.bref_layout_preset_index, len(scn.bref_layout_presets) - 1)
+        return {'FINISHED'}
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Drag / resize modal
 # ─────────────────────────────────────────────────────────────────────────────
@@ -539,36 +2024,96 @@ class VIEW3D_OT_drag_images(bpy.types.Operator):
     _active = False
     _idx = -1
     _resize, _k_hold = False, False
+    _c_hold, _crop_edge, _crop_start = False, None, None
+    _pan = False
     _offset = Vector((0, 0))
     _sm = Vector((0, 0))
+    _pan_start = Vector((0, 0))
+    _pan_offset = Vector((0, 0))
     _sw = _sh = _ratio = 0.0
+    _edges = None
+
+    ZOOM_STEP = 1.15
 
     @classmethod
     def poll(cls, ctx):
         return not cls._active and ctx.area.type == 'VIEW_3D' and ctx.scene.draggable_images
 
+    @staticmethod
+    def _over_ui(ctx, event):
+        for region in ctx.area.regions:
+            if region.type == 'UI':
+                if (region.x <= event.mouse_x <= region.x + region.width and
+                        region.y <= event.mouse_y <= region.y + region.height):
+                    return True
+        return False
+
+    @staticmethod
+    def _visible_items(ctx, active_layer):
+        """(index, item) pairs shown on screen, topmost layer first"""
+        scn, reg = ctx.scene, ctx.region
+        col = scn.draggable_images
+        # Top layers first so they get priority
+        return [(i, col[i]) for i in visible_indices(
+            col, reg.width, reg.height, *_view(scn),
+            layer=None if scn.bref_show_all_layers else active_layer, top_first=True)]
+
+    def _end_drag(self, ctx):
+        self._idx, self._resize, self._edges = -1, False, None
+        self._crop_edge = self._crop_start = None
+        _snap_guides[0].clear()
+        _snap_guides[1].clear()
+        redraw(ctx)
+
     def modal(self, ctx, event):
+        if _recorder is not None:
+            record_event(ctx, event)
         scn, col = ctx.scene, ctx.scene.draggable_images
-        m = Vector((event.mouse_region_x, event.mouse_region_y))
-        show_all = scn.bref_show_all_layers
+        ms = Vector((event.mouse_region_x, event.mouse_region_y))
+        m = to_board(scn, ms.x, ms.y)
+        zoom = scn.bref_view.zoom
         active_layer = col[scn.drag_img_index].layer if col and 0 <= scn.drag_img_index < len(col) else 0
 
         # Allow interaction with UI
-        if event.type == 'LEFTMOUSE' and event.value == 'PRESS':
-            # Check if mouse is over UI region
-            for region in ctx.area.regions:
-                if region.type == 'UI':
-                    if (region.x <= event.mouse_x <= region.x + region.width and
-                            region.y <= event.mouse_y <= region.y + region.height):
-                        return {'PASS_THROUGH'}
+        if event.type in {'LEFTMOUSE', 'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE'} and \
+                event.value != 'RELEASE' and self._over_ui(ctx, event):
+            return {'PASS_THROUGH'}
 
         if event.type == 'K':
             self._k_hold = (event.value == 'PRESS')
             return {'RUNNING_MODAL'}
 
+        if event.type == 'C':
+            self._c_hold = (event.value == 'PRESS')
+            return {'RUNNING_MODAL'}
+
+        # Board pan (MMB drag) and zoom about the cursor (wheel)
+        if event.type == 'MIDDLEMOUSE':
+            self._pan = (event.value == 'PRESS')
+            if self._pan:
+                self._pan_start = ms.copy()
+                self._pan_offset = Vector(scn.bref_view.offset)
+            return {'RUNNING_MODAL'}
+
+        if event.type == 'MOUSEMOVE' and self._pan:
+            scn.bref_view.offset = self._pan_offset + (ms - self._pan_start)
+            return {'RUNNING_MODAL'}
+
+        if event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'}:
+            step = self.ZOOM_STEP if event.type == 'WHEELUPMOUSE' else 1.0 / self.ZOOM_STEP
+            view = scn.bref_view
+            view.zoom = zoom * step
+            # Keep the board point under the cursor fixed
+            view.offset = ms - m * view.zoom
+            return {'RUNNING_MODAL'}
+
         if event.type == 'MOUSEMOVE' and self._idx != -1:
             it = col[self._idx]
-            if self._resize:
+            if self._crop_edge:
+                d = m - self._sm
+                crop_edge(it, self._crop_edge, d.x if self._crop_edge in {'LEFT', 'RIGHT'} else d.y,
+                          self._crop_start)
+            elif self._resize:
                 dx, dy = m.x - self._sm.x, m.y - self._sm.y
                 w, h = self._sw + dx, self._sh + dy
                 if it.maintain_aspect and self._ratio:
@@ -581,45 +2126,87 @@ class VIEW3D_OT_drag_images(bpy.types.Operator):
             else:
                 new_x = m.x - self._offset.x
                 new_y = m.y - self._offset.y
+                gs = scn.grid_settings
+
+                # Edges / centres of other images win over the grid
+                hit_x = hit_y = None
+                if self._edges:
+                    tol = gs.snap_distance / zoom
+                    hit_x = EdgeIndex.snap(self._edges.xs, (new_x, new_x + it.width * 0.5, new_x + it.width), tol)
+                    hit_y = EdgeIndex.snap(self._edges.ys, (new_y, new_y + it.height * 0.5, new_y + it.height), tol)
+                _snap_guides[0][:] = [hit_x[1]] if hit_x else []
+                _snap_guides[1][:] = [hit_y[1]] if hit_y else []
 
                 # Apply grid snapping if enabled
-                if scn.grid_settings.enabled:
-                    grid_size = scn.grid_settings.size
-                    new_x = snap_to_grid(new_x, grid_size)
-                    new_y = snap_to_grid(new_y, grid_size)
+                if hit_x:
+                    new_x += hit_x[0]
+                elif gs.enabled:
+                    new_x = snap_to_grid(new_x, gs.size)
+                if hit_y:
+                    new_y += hit_y[0]
+                elif gs.enabled:
+                    new_y = snap_to_grid(new_y, gs.size)
 
                 it.x, it.y = new_x, new_y
             redraw(ctx)
             return {'RUNNING_MODAL'}
 
-        if event.type == 'LEFTMOUSE' and event.value == 'PRESS':
-            # Filter items based on visibility settings
-            visible_items = [
-                (i, it) for i, it in enumerate(col)
-                if show_all or it.layer == active_layer
-            ]
+        if event.type == 'E' and event.value == 'PRESS':
+            # Eyedropper: sample the topmost reference under the cursor
+            for i, it in self._visible_items(ctx, active_layer):
+                if _hit(m, it):
+                    try:
+                        rgba = sample_color(it, m, scn.frame_current)
+                    except Exception as e:
+                        self.report({'WARNING'}, f"Could not sample {os.path.basename(it.filepath)}: {e}")
+                        return {'RUNNING_MODAL'}
+                    scn.bref_picked_color = rgba.clip(0.0, 1.0)
+                    r, g, b = (round(max(0.0, min(1.0, c)) * 255) for c in rgba[:3])
+                    hex_code = f"#{r:02X}{g:02X}{b:02X}"
+                    if scn.bref_copy_picked_hex:
+                        ctx.window_manager.clipboard = hex_code
+                    self.report({'INFO'}, f"Picked {hex_code}" + (" (copied)" if scn.bref_copy_picked_hex else ""))
+                    redraw(ctx)
+                    return {'RUNNING_MODAL'}
+            return {'PASS_THROUGH'}
 
-            # Sort by layer so top layers get priority
-            visible_items.sort(key=lambda x: x[1].layer, reverse=True)
+        if event.type == 'LEFTMOUSE' and event.value == 'PRESS':
+            visible_items = self._visible_items(ctx, active_layer)
 
             for i, it in visible_items:
-                if _corner(m, it) or self._k_hold:
+                if self._c_hold:
+                    # Crop: drag the edge nearest to the cursor
+                    if not _inside(m, it):
+                        continue
+                    if not it.use_crop:
+                        it.crop_min, it.crop_max = (0.0, 0.0), (1.0, 1.0)
+                        it.use_crop = True
+                    self._idx, self._crop_edge, self._sm = i, _nearest_edge(m, it), m.copy()
+                    self._crop_start = (it.x, it.y, it.width, it.height, *crop_rect(it))
+                    scn.drag_img_index = i
+                    return {'RUNNING_MODAL'}
+                if _corner(m, it, 30 / zoom) or self._k_hold:
                     self._idx, self._resize = i, True
                     self._sm, self._sw, self._sh = m.copy(), it.width, it.height
                     self._ratio, scn.drag_img_index = it.width / it.height if it.height else 1, i
                     return {'RUNNING_MODAL'}
-                if _inside(m, it):
+                if _hit(m, it):
                     self._idx, self._resize = i, False
                     self._offset = m - Vector((it.x, it.y))
                     scn.drag_img_index = i
+                    if scn.grid_settings.snap_to_images:
+                        self._edges = EdgeIndex([o for j, o in visible_items if j != i])
                     return {'RUNNING_MODAL'}
             return {'PASS_THROUGH'}
 
         if event.type == 'LEFTMOUSE' and event.value == 'RELEASE':
-            self._idx, self._resize = -1, False
+            self._end_drag(ctx)
             return {'RUNNING_MODAL'}
 
         if event.type in {'RIGHTMOUSE', 'ESC'}:
+            # Exiting mid-drag must not leave guides behind for the next session
+            self._end_drag(ctx)
+            self._pan = False
             self.__class__._active = False
             return {'CANCELLED'}
 
@@ -629,12 +2216,162 @@ class VIEW3D_OT_drag_images(bpy.types.Operator):
     def invoke(self, ctx, _):
         self.__class__._active = True
         self._idx = -1
-        self._resize = self._k_hold = False
+        self._resize = self._k_hold = self._c_hold = self._pan = False
+        self._edges = self._crop_edge = self._crop_start = None
         ctx.window_manager.modal_handler_add(self)
-        self.report({'INFO'}, "Drag Mode — RMB/ESC exit • K resize • Drag corners to resize")
+        self.report({'INFO'}, "Drag Mode — RMB/ESC exit • K resize • Drag corners to resize • MMB pan • Wheel zoom • E pick colour • C+drag crop")
         return {'RUNNING_MODAL'}
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Drag-mode event recording & replay
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Event fields the modal reads; enough to feed it again without a window
+_EVENT_FIELDS = ("type", "value", "mouse_region_x", "mouse_region_y",
+                 "mouse_x", "mouse_y", "ctrl", "shift", "alt")
+
+
+def record_event(ctx, event):
+    if _recorder["region"] is None:
+        _recorder["region"] = [ctx.region.width, ctx.region.height]
+    rec = {f: getattr(event, f) for f in _EVENT_FIELDS}
+    rec["t"] = time.perf_counter() - _recorder["start"]
+    _recorder["events"].append(rec)
+
+
+class IMAGE_OT_record_events(bpy.types.Operator):
+    bl_idname, bl_label = "image.record_drag_events", "Record Drag Events"
+    bl_description = "Start recording the events Drag Mode receives; run again to stop and save them for replay"
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, ctx):
+        global _recorder
+        if _recorder is None:
+            return {'CANCELLED'}
+        if not _recorder["events"]:
+            self.report({'WARNING'}, "Drag Mode received no events, nothing to save")
+            _recorder = None
+            redraw(ctx)
+            return {'CANCELLED'}
+        with open(bpy.path.abspath(self.filepath), "w", encoding="utf-8") as fh:
+            json.dump(_recorder, fh)
+        self.report({'INFO'}, f"Saved {len(_recorder['events'])} event(s) to {self.filepath}")
+        _recorder = None
+        redraw(ctx)
+        return {'FINISHED'}
+
+    def invoke(self, ctx, _):
+        global _recorder
+        if _recorder is None:
+            view = ctx.scene.bref_view
+            _recorder = {"region": None, "view": [*view.offset, view.zoom],
+                         "start": time.perf_counter(), "events": []}
+            self.report({'INFO'}, "Recording Drag Mode events")
+            redraw(ctx)
+            return {'FINISHED'}
+        if not _recorder["events"]:
+            return self.execute(ctx)
+        self.filepath = "//bref_events.json" if bpy.data.filepath else "bref_events.json"
+        ctx.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+# Every item column the modal can write: (property, dtype, values per item)
+REPLAY_COLUMNS = tuple((name, dtype, 1) for name, dtype in LAYOUT_COLUMNS) + (
+    ("use_crop", np.bool_, 1), ("crop_min", np.float32, 2), ("crop_max", np.float32, 2),
+)
+
+
+def replay_events(path, images=1000, seed=0):
+    """Feed a recorded event log through the drag modal on a synthetic board
+
+    Runs without a window: the region, area and window manager are plain
+    stand-ins, and the board is n random rects with no textures. Timings are
+    ignored, events are replayed back to back so runs are comparable.
+    Returns latency percentiles (µs), the number of item / view values the
+    events changed, redraws the modal asked for and redraws fired by the
+    update callbacks of the properties it wrote.
+    """
+    from types import SimpleNamespace
+    with open(path, encoding="utf-8") as fh:
+        rec = json.load(fh)
+
+    if not rec.get("region"):
+        print(f"BRef: {path} has no region size (no Drag Mode events?), replaying at 1920x1080")
+        rec["region"] = (1920, 1080)
+    region = SimpleNamespace(type='WINDOW', x=0, y=0, width=rec["region"][0], height=rec["region"][1])
+    scene = bpy.data.scenes.new("BRef Replay")
+    col = scene.draggable_images
+    rng = np.random.default_rng(seed)
+    for i, (x, y, w, h) in enumerate(rng.uniform((0, 0, 40, 40), (region.width, region.height, 400, 400),
+                                                 (images, 4))):
+        it = col.add()
+        it.x, it.y, it.width, it.height, it.layer = x - w / 2, y - h / 2, w, h, i
+    scene.bref_view.offset, scene.bref_view.zoom = rec["view"][:2], rec["view"][2]
+
+    ctx = SimpleNamespace(scene=scene, region=region,
+                          area=SimpleNamespace(type='VIEW_3D', regions=[region]),
+                          window_manager=SimpleNamespace(windows=[], clipboard="",
+                                                         modal_handler_add=lambda op: None))
+    # The modal is plain Python, run it on a throw-away stand-in class
+    ns = {k: v for k, v in VIEW3D_OT_drag_images.__dict__.items()
+          if not k.startswith("__") and not k.startswith("bl_") and k != "poll"}
+    ns["report"] = lambda self, kind, msg: None
+    op = type("BRefReplayDrag", (), ns)()
+
+    # Code objects of the modal's own methods, to tell its redraws from callbacks'
+    modal_code = {f.__code__ for f in ns.values() if hasattr(f, "__code__")}
+    redraws = callback_redraws = 0
+    def count_redraw(_):
+        nonlocal redraws, callback_redraws
+        if sys._getframe(1).f_code in modal_code:
+            redraws += 1
+        else:
+            callback_redraws += 1
+
+    def snapshot():
+        cols = []
+        for attr, dtype, size in REPLAY_COLUMNS:
+            arr = np.empty(len(col) * size, dtype=dtype)
+            col.foreach_get(attr, arr)
+            cols.append(arr.astype(np.float64))
+        v = scene.bref_view
+        return np.concatenate(cols + [np.array([*v.offset, v.zoom, scene.drag_img_index], dtype=np.float64)])
+
+    global redraw
+    real_redraw, redraw = redraw, count_redraw
+    latencies, changes = [], 0
+    try:
+        op.invoke(ctx, None)
+        before = snapshot()
+        for e in rec["events"]:
+            event = SimpleNamespace(**{f: e[f] for f in _EVENT_FIELDS})
+            t0 = time.perf_counter()
+            result = op.modal(ctx, event)
+            latencies.append((time.perf_counter() - t0) * 1e6)
+            after = snapshot()
+            changes += int(np.count_nonzero(after != before))
+            before = after
+            if 'CANCELLED' in result or 'FINISHED' in result:
+                break
+    finally:
+        redraw = real_redraw
+        op.__class__._active = False
+        bpy.data.scenes.remove(scene)
+
+    lat = np.array(latencies or [0.0])
+    return {
+        "events": len(latencies),
+        "images": images,
+        "latency_us": {f"p{p}": float(np.percentile(lat, p)) for p in (50, 90, 99)} | {"max": float(lat.max())},
+        "changed_values": changes,
+        "redraw_requests": redraws,
+        "callback_redraws": callback_redraws,
+    }
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Panel
 # ─────────────────────────────────────────────────────────────────────────────
@@ -688,13 +2425,32 @@ class VIEW3D_PT_bref_panel(bpy.types.Panel):
             instr_row = instr_box.row(align=True)
             instr_row.label(text="RMB/ESC: Exit", icon='MOUSE_RMB')
             instr_row.label(text="Resize: Hold K or Drag Top Right Corner",   icon='FULLSCREEN_ENTER')
+            instr_row = instr_box.row(align=True)
+            instr_row.label(text="MMB: Pan Board", icon='MOUSE_MMB')
+            instr_row.label(text="Wheel: Zoom Board", icon='ZOOM_IN')
+            instr_row = instr_box.row(align=True)
+            instr_row.label(text="E: Pick Colour", icon='EYEDROPPER')
+            instr_row.label(text="C + Drag Edge: Crop", icon='SELECT_SUBTRACT')
         else:
             drag_box.operator("view3d.drag_images", text="Enter Drag Mode", icon='HAND')
+        view_row = drag_box.row(align=True)
+        view_row.prop(scn.bref_view, "zoom", text="Zoom")
+        view_row.operator("image.reset_board_view", text="", icon='HOME')
+        view_row.operator("image.record_drag_events", text="",
+                          icon='SNAP_FACE' if _recorder is not None else 'REC', depress=_recorder is not None)
 
         if scn.draggable_images and 0 <= scn.drag_img_index < len(scn.draggable_images):
             it = scn.draggable_images[scn.drag_img_index]
             box = lay.box()
             box.label(text="Selected Image", icon='BORDERMOVE')
+            if icon := preview_icon(it.filepath):
+                box.template_icon(icon_value=icon, scale=5.0)
+            if it.duplicate_of:
+                dup_row = box.row()
+                dup_row.alert = True
+                dup_row.label(text=f"Looks like {it.duplicate_of}", icon='DUPLICATE')
+                dup_row.operator("image.clear_duplicate_flag", text="", icon='X')
+            box.prop(it, "tags", icon='BOOKMARKS')
             split = box.split(factor=0.5)
             size_col = split.column()
             size_col.label(text="Size", icon='FULLSCREEN_ENTER')
@@ -716,18 +2472,90 @@ class VIEW3D_PT_bref_panel(bpy.types.Panel):
             flip_row = transform_box.row(align=True)
             flip_row.prop(it, "flip_x", text="Flip X", toggle=True, icon='MOD_MIRROR')
             flip_row.prop(it, "flip_y", text="Flip Y", toggle=True, icon='MOD_MIRROR')
+            crop_row = transform_box.row(align=True)
+            crop_row.prop(it, "use_crop", toggle=True, icon='SELECT_SUBTRACT')
+            crop_row.operator("image.duplicate_draggable", text="Duplicate", icon='DUPLICATE')
+            if it.use_crop:
+                crop_vals = transform_box.row(align=True)
+                crop_vals.prop(it, "crop_min", text="")
+                crop_vals.prop(it, "crop_max", text="")
             control_box = box.box()
             control_box.label(text="Appearance", icon='SETTINGS')
             control_box.prop(it, "alpha", slider=True, text="Opacity")
+            adjust_box = box.box()
+            adjust_head = adjust_box.row()
+            adjust_head.label(text="Adjustments", icon='MODIFIER')
+            adjust_head.operator("image.reset_adjustments", text="", icon='LOOP_BACK')
+            toggle_row = adjust_box.row(align=True)
+            toggle_row.prop(it, "grayscale", toggle=True)
+            toggle_row.prop(it, "invert", toggle=True)
+            adjust_row = adjust_box.row(align=True)
+            adjust_row.prop(it, "contrast", slider=True)
+            adjust_row.prop(it, "exposure")
+            adjust_box.prop(it, "tint")
+            sil_row = adjust_box.row(align=True)
+            sil_row.prop(it, "use_silhouette", toggle=True)
+            sub = sil_row.row(align=True)
+            sub.active = it.use_silhouette
+            sub.prop(it, "silhouette_threshold", slider=True)
+            color_box = box.box()
+            color_box.label(text="Colour", icon='EYEDROPPER')
+            color_row = color_box.row(align=True)
+            color_row.prop(scn, "bref_picked_color", text="")
+            color_row.prop(scn, "bref_copy_picked_hex", text="", icon='COPYDOWN')
+            color_row.operator("image.extract_palette", text="Palette", icon='COLOR')
+            palette = bpy.data.palettes.get("BRef Palette")
+            if palette and palette.colors:
+                swatches = color_box.row(align=True)
+                for pc in palette.colors:
+                    swatches.prop(pc, "color", text="")
+            source_box = box.box()
+            source_box.label(text="Source", icon='SEQUENCE')
+            source_box.prop(it, "source_type", text="")
+            if it.source_type == 'SEQUENCE':
+                seq_row = source_box.row(align=True)
+                seq_row.prop(it, "frame_start", text="Start")
+                seq_row.prop(it, "frame_offset", text="Offset")
+                source_box.prop(it, "use_cyclic")
+                ring = _seq_rings.get(it.filepath)
+                source_box.label(text=f"{len(sequence_frames(it.filepath))} frames • "
+                                      f"{len(ring.frames) if ring else 0} buffered")
+                source_box.prop(scn, "bref_frame_buffer")
+            cached = _tex_cache.get(it.filepath)
+            if cached and cached[1]:
+                ram, vram = image_memory(*cached)
+                box.label(text=f"RAM {format_bytes(ram)} • VRAM {format_bytes(vram)}", icon='MEMORY')
             box.separator()
             box.operator("image.reset_draggable_position", icon='PIVOT_ACTIVE', text="Center Image")
 
 
+        # MEMORY
+        mem_box = lay.box()
+        mem_box.label(text="Memory", icon='MEMORY')
+        mem_row = mem_box.row(align=True)
+        mem_row.prop(scn, "bref_gpu_only", text="GPU-Only Residency", toggle=True)
+        mem_row.operator("image.free_reference_buffers", text="", icon='TRASH')
+        entries = list(_tex_cache.values())
+        entries += [e for ring in _seq_rings.values() for e in ring.frames.values()]
+        ram = vram = 0
+        for img, tex in entries:
+            if tex:
+                r, v = image_memory(img, tex)
+                ram, vram = ram + r, vram + v
+        mem_box.label(text=f"{len(entries)} textures • RAM {format_bytes(ram)} • VRAM {format_bytes(vram)}")
+        pack_row = mem_box.row(align=True)
+        pack_row.operator("image.pack_optimized", icon='PACKAGE')
+        pack_row.operator("image.relink_originals", text="", icon='LINKED')
+
         # Add Grid Settings
         grid_box = lay.box()
         grid_box.label(text="Grid Settings", icon='GRID')
         grid_box.prop(ctx.scene.grid_settings, "enabled", text="Snap to Grid")
 
+        snap_row = grid_box.row(align=True)
+        snap_row.prop(ctx.scene.grid_settings, "snap_to_images", text="Snap to Images")
+        snap_row.prop(ctx.scene.grid_settings, "snap_distance", text="Distance")
+
         if ctx.scene.grid_settings.enabled:
             grid_row = grid_box.row(align=True)
             grid_row.prop(ctx.scene.grid_settings, "size", text="Grid Size")
@@ -749,6 +2577,16 @@ class VIEW3D_PT_bref_panel(bpy.types.Panel):
         arrange_op = arrange_row.operator("image.smart_arrange", text="Arrange All", icon='ALIGN_JUSTIFY')
         arrange_op.arrange_all = True
 
+        preset_row = arrange_box.row()
+        preset_row.template_list("UI_UL_list", "bref_layout_presets", scn, "bref_layout_presets",
+                                 scn, "bref_layout_preset_index", rows=3)
+        preset_col = preset_row.column(align=True)
+        preset_col.operator("image.layout_preset_add", text="", icon='ADD')
+        preset_col.operator("image.layout_preset_remove", text="", icon='REMOVE')
+        preset_col.separator()
+        preset_col.operator("image.layout_preset_update", text="", icon='FILE_REFRESH')
+        arrange_box.operator("image.layout_preset_apply", icon='CHECKMARK')
+
 
         # ───── ORTHOGRAPHIC  ─────
         ortho = scn.ortho_refs
@@ -758,12 +2596,22 @@ class VIEW3D_PT_bref_panel(bpy.types.Panel):
         if ortho.enabled:
             # distance slider (± offset from origin)
             ortho_box.prop(ortho, "offset", text="Distance")
+            ortho_box.prop(ortho, "sheet_filepath", text="Sheet")
+            if ortho.sheet_filepath:
+                ortho_box.prop(ortho, "textured_solid")
 
             # helper to draw one view’s controls
             def _draw_view(box, label, ref):
                 row_box = box.box()
-                row_box.label(text=label)
-                row_box.prop(ref, "filepath", text="")
+                head = row_box.row()
+                head.label(text=label)
+                head.prop(ref, "use_sheet", text="Sheet", toggle=True, icon='UV')
+                if ref.use_sheet:
+                    r = row_box.row(align=True)
+                    r.prop(ref, "crop_min", text="")
+                    r.prop(ref, "crop_max", text="")
+                else:
+                    row_box.prop(ref, "filepath", text="")
                 r = row_box.row(align=True)
                 r.prop(ref, "alpha", text="Alpha")
                 r.prop(ref, "size",  text="Size")
@@ -855,21 +2703,27 @@ def draw_grid(ctx):
     region = ctx.region
     width, height = region.width, region.height
 
-    # Calculate grid lines
-    h_lines = [(0, y, width, y) for y in range(0, height, int(grid_size))]
-    v_lines = [(x, 0, x, height) for x in range(0, width, int(grid_size))]
+    # Grid lives on the board, so place its lines through the pan / zoom
+    ox, oy, zoom = _view(ctx.scene)
+    step = grid_size * zoom
+    if step < 4:  # Too dense to be useful
+        return
 
     # Draw grid
     shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
 
     # Horizontal lines
     coords = []
-    for y in range(0, height, int(grid_size)):
+    y = oy - math.floor(oy / step) * step
+    while y < height:
         coords.extend([(0, y), (width, y)])
+        y += step
 
     # Vertical lines
-    for x in range(0, width, int(grid_size)):
+    x = ox - math.floor(ox / step) * step
+    while x < width:
         coords.extend([(x, 0), (x, height)])
+        x += step
 
     batch = batch_for_shader(shader, 'LINES', {"pos": coords})
 
@@ -881,6 +2735,27 @@ def draw_grid(ctx):
     gpu.state.blend_set('NONE')
 
 
+def draw_snap_guides(ctx, color=(1.0, 0.2, 0.8, 0.9)):
+    """Draw the active snap lines across the region, in board space"""
+    if not (_snap_guides[0] or _snap_guides[1]):
+        return
+    reg = ctx.region
+    lo, hi = to_board(ctx.scene, 0, 0), to_board(ctx.scene, reg.width, reg.height)
+    coords = []
+    for x in _snap_guides[0]:
+        coords.extend([(x, lo.y), (x, hi.y)])
+    for y in _snap_guides[1]:
+        coords.extend([(lo.x, y), (hi.x, y)])
+
+    line_shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+    batch = batch_for_shader(line_shader, 'LINES', {"pos": coords})
+    gpu.state.line_width_set(1.5)
+    line_shader.bind()
+    line_shader.uniform_float("color", color)
+    batch.draw(line_shader)
+    gpu.state.line_width_set(1.0)
+
+
 def draw_cb():
     ctx = bpy.context
     scn, imgs = ctx.scene, ctx.scene.draggable_images
@@ -893,50 +2768,75 @@ def draw_cb():
 
     show_all = scn.bref_show_all_layers
     active_layer = imgs[scn.drag_img_index].layer if imgs and 0 <= scn.drag_img_index < len(imgs) else 0
-    draw_list = [i for i in imgs if show_all or i.layer == active_layer]
+
+    # Cull off-screen references before they ever touch the texture cache
+    reg = ctx.region
+    ox, oy, zoom = _view(scn)
+    draw_list = [imgs[i] for i in visible_indices(imgs, reg.width, reg.height, ox, oy, zoom,
+                                                  layer=None if show_all else active_layer)]
+
+    # Textures culled for a while are released, so VRAM follows the view
+    now = time.monotonic()
+    if now - _last_evict[0] > 1.0:
+        _last_evict[0] = now
+        evict_idle_textures(now)
 
     gpu.state.blend_set('ALPHA')
-    for it in sorted(draw_list, key=lambda i: i.layer):
+    gpu.matrix.push()
+    gpu.matrix.translate((ox, oy))
+    gpu.matrix.scale((zoom, zoom))
+    for it in draw_list:
         fp = it.filepath
         if not fp:
             continue
-        if fp not in _tex_cache:
-            img, tex = safe_load_image(fp)
+        _tex_seen[fp] = now
+        if it.source_type == 'SEQUENCE':
+            tex = sequence_texture(it, scn.frame_current)
+            if tex is None:
+                continue
+        elif fp not in _tex_cache:
+            img, tex = safe_load_image(fp, it.packed_image)
             if not tex:
                 continue
             _tex_cache[fp] = (img, tex)
         elif _tex_cache[fp][1] is None:
             continue
-
-        try:
+        else:
             tex = _tex_cache[fp][1]
 
+        try:
             x, y, w, h = it.x, it.y, it.width, it.height
             coords = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
-            u0, u1 = (1, 0) if it.flip_x else (0, 1)
-            v0, v1 = (1, 0) if it.flip_y else (0, 1)
-            uvs = [(u0, v0), (u1, v0), (u1, v1), (u0, v1)]
-
-            batch = batch_for_shader(shader(), 'TRI_FAN', {"pos": coords, "texCoord": uvs})
-            shader().bind()
-            shader().uniform_float("color", (1, 1, 1, it.alpha))
-            shader().uniform_sampler("image", tex)
-            batch.draw(shader())
+            uvs = crop_uvs(it)
+
+            sh = shader()
+            batch = batch_for_shader(sh, 'TRI_FAN', {"pos": coords, "texCoord": uvs})
+            sh.bind()
+            sh.uniform_float("color", (*it.tint, it.alpha))
+            if _shader_adjusts:
+                sh.uniform_float("adjust", (it.contrast, it.exposure, float(it.grayscale), float(it.invert)))
+                sh.uniform_float("silhouette", (float(it.use_silhouette), it.silhouette_threshold, 0.0, 0.0))
+            sh.uniform_sampler("image", tex)
+            batch.draw(sh)
 
             # Draw frame and handles when in drag mode
             if VIEW3D_OT_drag_images._active:
                 # Draw green frame
                 draw_frame(x, y, w, h)
 
-                # Draw corner handles at each corner
-                draw_corner_handle(x + w, y + h)  # Bottom-right
-                draw_corner_handle(x, y + h)  # Bottom-left
-                draw_corner_handle(x + w, y)  # Top-right
-                draw_corner_handle(x, y)  # Top-left
+                # Draw corner handles at each corner, constant size on screen
+                hs = 20.0 / zoom
+                draw_corner_handle(x + w, y + h, hs)  # Bottom-right
+                draw_corner_handle(x, y + h, hs)  # Bottom-left
+                draw_corner_handle(x + w, y, hs)  # Top-right
+                draw_corner_handle(x, y, hs)  # Top-left
         except Exception as e:
             print(f"Error drawing image {fp}: {e}")
             continue
 
+    if VIEW3D_OT_drag_images._active:
+        draw_snap_guides(ctx)
+    gpu.matrix.pop()
     gpu.state.blend_set('NONE')
 
     if VIEW3D_OT_drag_images._active:
@@ -948,6 +2848,7 @@ def draw_cb():
             txt += f" • Only layer {active_layer} visible"
         if scn.grid_settings.enabled:
             txt += f" • Grid snap: {int(scn.grid_settings.size)}px"
+        txt += f" • MMB pan • Wheel zoom {int(zoom * 100)}% • E pick colour • C+drag crop"
         w, _ = blf.dimensions(0, txt)
         blf.position(0, reg.width - w - 15, 20, 0)
         blf.draw(0, txt)
@@ -961,14 +2862,29 @@ classes = (
     DraggableImage,
     OrthographicReferences,
     GridSettings,
+    BoardView,
+    BRefLayoutPreset,
     ArrangeSettings,
     IMAGE_UL_draggable,
 
     IMAGE_OT_add,
+    IMAGE_OT_duplicate,
+    IMAGE_OT_clear_duplicate,
     IMAGE_OT_remove,
+    IMAGE_OT_free_buffers,
+    IMAGE_OT_pack_optimized,
+    IMAGE_OT_relink_originals,
+    IMAGE_OT_extract_palette,
+    IMAGE_OT_reset_adjustments,
     IMAGE_OT_move_layer,
     IMAGE_OT_reset_position,
+    IMAGE_OT_reset_view,
+    IMAGE_OT_layout_preset_add,
+    IMAGE_OT_layout_preset_update,
+    IMAGE_OT_layout_preset_apply,
+    IMAGE_OT_layout_preset_remove,
     VIEW3D_OT_drag_images,
+    IMAGE_OT_record_events,
     IMAGE_OT_smart_arrange,
 
     ORTHO_OT_spawn_references,
@@ -996,13 +2912,46 @@ def register():
 
     bpy.types.Scene.ortho_refs = bpy.props.PointerProperty(type=OrthographicReferences)
     bpy.types.Scene.grid_settings = bpy.props.PointerProperty(type=GridSettings)
-
-    global _handle
+    bpy.types.Scene.bref_view = bpy.props.PointerProperty(type=BoardView)
+    bpy.types.Scene.bref_layout_presets = bpy.props.CollectionProperty(type=BRefLayoutPreset)
+    bpy.types.Scene.bref_layout_preset_index = bpy.props.IntProperty()
+    bpy.types.Scene.bref_frame_buffer = bpy.props.IntProperty(
+        name="Frame Buffer",
+        description="Frames of each image sequence decoded ahead of the playhead",
+        default=24, min=2, max=512,
+        update=lambda s, c: [release_sequence(fp) for fp in list(_seq_rings)])
+    bpy.types.Scene.bref_gpu_only = bpy.props.BoolProperty(
+        name="GPU-Only Residency",
+        description="Free the decoded pixels of overlay references from RAM once their texture is uploaded; "
+                    "they are decoded again only when something needs them",
+        default=False, update=_cb_residency)
+    bpy.types.Scene.bref_picked_color = bpy.props.FloatVectorProperty(
+        name="Picked Colour", subtype='COLOR_GAMMA', size=4, min=0.0, max=1.0,
+        default=(1.0, 1.0, 1.0, 1.0))
+    bpy.types.Scene.bref_copy_picked_hex = bpy.props.BoolProperty(
+        name="Copy Hex",
+        description="Also copy the hex code of each picked colour to the clipboard",
+        default=False)
+
+    for h in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if _invalidate_index not in h:
+            h.append(_invalidate_index)
+    if _reset_caches not in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(_reset_caches)
+
+    global _handle, _previews
+    if _previews is None:
+        _previews = bpy.utils.previews.new()
     if _handle is None:
         _handle = bpy.types.SpaceView3D.draw_handler_add(draw_cb, (), 'WINDOW', 'POST_PIXEL')
 
 
 def unregister():
+    for h in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post):
+        if _invalidate_index in h:
+            h.remove(_invalidate_index)
+    if _reset_caches in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(_reset_caches)
     bpy.types.SpaceView3D.draw_handler_remove(_handle, 'WINDOW')
     for img, tex in _tex_cache.values():
         try:
@@ -1010,12 +2959,38 @@ def unregister():
         except Exception:
             pass
     _tex_cache.clear()
+    _tex_seen.clear()
+    _mask_cache.clear()
+    _mask_queue.clear()
+    if bpy.app.timers.is_registered(_mask_tick):
+        bpy.app.timers.unregister(_mask_tick)
+    if bpy.app.timers.is_registered(_prefetch_tick):
+        bpy.app.timers.unregister(_prefetch_tick)
+    for fp in list(_seq_rings):
+        release_sequence(fp)
+    _pixel_cache.clear()
+    _phash_cache.clear()
+    global _recorder, _previews
+    _recorder = None
+    if bpy.app.timers.is_registered(_preview_tick):
+        bpy.app.timers.unregister(_preview_tick)
+    _preview_queue.clear()
+    if _previews is not None:
+        bpy.utils.previews.remove(_previews)
+        _previews = None
 
     del bpy.types.Scene.draggable_images
     del bpy.types.Scene.drag_img_index
     del bpy.types.Scene.arrange_settings
     del bpy.types.Scene.bref_show_all_layers
     del bpy.types.Scene.grid_settings
+    del bpy.types.Scene.bref_view
+    del bpy.types.Scene.bref_layout_presets
+    del bpy.types.Scene.bref_layout_preset_index
+    del bpy.types.Scene.bref_frame_buffer
+    del bpy.types.Scene.bref_gpu_only
+    del bpy.types.Scene.bref_picked_color
+    del bpy.types.Scene.bref_copy_picked_hex
     del bpy.types.Scene.ortho_refs
 
     for c in reversed(classes):
@@ -1028,9 +3003,155 @@ def unregister():
     for name in _ORTHO_EMPTY_NAMES.values():
         obj = bpy.data.objects.get(name)
         if obj:
-            bpy.data.objects.remove(obj, do_unlink=True)
+            _remove_ortho_object(obj)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Command line – headless board builder
+# ─────────────────────────────────────────────────────────────────────────────
+#
+#   blender -b shot.blend --python BRef.py -- --dir refs/ --save
+#   blender -b --python BRef.py -- --manifest board.json --blends shots/*.blend --jobs 8
+#   blender -b --python BRef.py -- --replay bref_events.json --images 2000
+#
+# A manifest is JSON: {"images": [...], "viewport": [w, h], "sheet": path,
+# "ortho": {"front": path | {"crop": [u0, v0, u1, v1]}, ...}}; relative paths
+# resolve against the manifest's folder.
+
+def _image_files(directory):
+    exts = set(bpy.path.extensions_image)
+    return [os.path.join(directory, f) for f in sorted(os.listdir(directory))
+            if os.path.splitext(f)[1].lower() in exts]
+
+
+def load_manifest(path):
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    root = os.path.dirname(os.path.abspath(path))
+    resolve = lambda p: p if os.path.isabs(p) else os.path.join(root, p)
+
+    data["images"] = [resolve(p) for p in data.get("images", [])]
+    if data.get("sheet"):
+        data["sheet"] = resolve(data["sheet"])
+    data["ortho"] = {k: resolve(v) if isinstance(v, str) else v
+                     for k, v in data.get("ortho", {}).items()}
+    return data
+
+
+def build_board(scene, images=(), viewport=(1920, 1080), ortho=None, sheet=""):
+    """Populate scene's overlay and ortho refs with no UI or region
+
+    Images are packed with arrange_images against a virtual viewport of the
+    given size. Returns the number of overlay references added.
+    """
+    col, added = scene.draggable_images, []
+    for fp in images:
+        if not os.path.isfile(fp):
+            print(f"BRef: skipping missing {fp}")
+            continue
+        try:
+            add_reference(col, fp, upload=not bpy.app.background)
+            # Keep indices: col.add() reallocates and stales earlier items
+            added.append(len(col) - 1)
+        except Exception as e:
+            print(f"BRef: failed to load {fp}: {e}")
+    if added:
+        arrange_images([col[i] for i in added], list(col), viewport[0], viewport[1],
+                       scene.arrange_settings.size_reduction)
+        scene.drag_img_index = len(col) - 1
+
+    if ortho:
+        refs = scene.ortho_refs
+        refs.enabled = True
+        if sheet:
+            refs.sheet_filepath = sheet
+        for key, spec in ortho.items():
+            if key.upper() not in _ORTHO_EMPTY_NAMES:
+                print(f"BRef: skipping unknown ortho view {key!r} "
+                      f"(expected one of {', '.join(k.lower() for k in _ORTHO_EMPTY_NAMES)})")
+                continue
+            view = getattr(refs, key.lower())
+            if isinstance(spec, str):
+                view.filepath, view.use_sheet = spec, False
+            else:
+                crop = spec["crop"]
+                view.use_sheet, view.crop_min, view.crop_max = True, crop[:2], crop[2:]
+        with bpy.context.temp_override(scene=scene, collection=scene.collection):
+            bpy.ops.bref.spawn_ortho_refs()
+    return len(added)
+
+
+def run_parallel(blends, args, jobs):
+    """Run this script on every .blend in its own background Blender"""
+    import subprocess
+    from concurrent.futures import ThreadPoolExecutor
+
+    def work(blend):
+        # Factory startup: an installed BRef add-on would register everything twice
+        cmd = [bpy.app.binary_path, "-b", "--factory-startup", blend,
+               "--python", os.path.abspath(__file__), "--", *args, "--save"]
+        done = subprocess.run(cmd, capture_output=True, text=True)
+        return blend, done.returncode, done.stderr
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for blend, code, err in pool.map(work, blends):
+            print(f"BRef: {'ok' if code == 0 else 'FAILED'} {blend}")
+            if code:
+                failed += 1
+                print(err)
+    return 1 if failed else 0
+
+
+def main(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="BRef", description="Build BRef reference boards without a UI")
+    parser.add_argument("--dir", help="Add every image in this folder as an overlay reference")
+    parser.add_argument("--manifest", help="JSON manifest of images, ortho refs and viewport size")
+    parser.add_argument("--viewport", type=int, nargs=2, metavar=("W", "H"),
+                        help="Virtual viewport to pack the board into (default 1920 1080)")
+    parser.add_argument("--blends", nargs="+", help="Process these .blend files in parallel worker processes")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for --blends")
+    parser.add_argument("--save", action="store_true", help="Save the current .blend when done")
+    parser.add_argument("--replay", help="Replay a recorded Drag Mode event log and report latencies")
+    parser.add_argument("--images", type=int, default=1000, help="References on the synthetic --replay board")
+    parser.add_argument("--report", help="Write the --replay results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        result = replay_events(args.replay, args.images)
+        print(json.dumps(result, indent=2))
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as fh:
+                json.dump(result, fh, indent=2)
+        return 0
+
+    if args.blends:
+        shared = [a for a in argv if a not in args.blends and a not in ("--blends", "--save")]
+        # --jobs belongs to the driver only
+        if "--jobs" in shared:
+            i = shared.index("--jobs")
+            del shared[i:i + 2]
+        return run_parallel(args.blends, shared, max(1, args.jobs))
+
+    if args.save and not bpy.data.filepath:
+        print("BRef: --save needs a .blend to save into, e.g. blender -b shot.blend --python BRef.py -- ...")
+        return 1
+
+    spec = load_manifest(args.manifest) if args.manifest else {"images": [], "ortho": {}}
+    if args.dir:
+        spec["images"] += _image_files(args.dir)
+    viewport = args.viewport or spec.get("viewport") or (1920, 1080)
+
+    added = build_board(bpy.context.scene, spec["images"], viewport, spec["ortho"], spec.get("sheet", ""))
+    print(f"BRef: added {added} reference(s)")
+    if args.save:
+        bpy.ops.wm.save_mainfile()
+    return 0
 
 
 if __name__ == "__main__":
     register()
 
+    if "--" in sys.argv:
+        sys.exit(main(sys.argv[sys.argv.index("--") + 1:]))
+